@@ -196,7 +196,7 @@ class TeddyRuxpinApp:
         self.audio_player = AudioPlayer(on_playback_complete=self._on_playback_complete)
 
         # Initialize filler phrase manager with personality-specific directory, phrases, and device type
-        # This pre-loads all filler audio into memory for instant access
+        # Files are catalogued here and each is decoded once, on first use
         self.filler_manager = FillerPhraseManager(
             self.personality.filler_audio_dir,
             self.personality.filler_phrases,
@@ -835,7 +835,7 @@ Now respond to their question naturally, as if your filler phrase was the beginn
         # - TTS + RVC for first chunk: 3-5s
         if self.state_machine.state == ConversationState.PROCESSING and not self._sequential_playback_active:
             # Calculate time in state
-            time_in_state = time.time() - getattr(self.state_machine, '_last_transition_time', time.time())
+            time_in_state = self.state_machine.time_in_state
             if time_in_state > 30.0:
                 logger.error(f"RECOVERY: Stuck in PROCESSING for {time_in_state:.1f}s - forcing IDLE")
                 self.audio_player.stop()
@@ -25,6 +25,16 @@ class ConversationEngine:
     Manages conversation with the configured GPT model, including context and history.
     """
 
+    # Friendly fallbacks spoken in character when the model call fails. Built
+    # once at class creation so _get_error_response is a plain dict lookup.
+    ERROR_RESPONSES = {
+        "rate_limit": "I'm having trouble thinking right now. Maybe I need a little rest?",
+        "connection": "I can't seem to reach my thoughts right now. Can we try again in a moment?",
+        "api": "Something's not quite right with my thinking. Let's try that again!",
+        "unknown": "Oh dear, I got a bit confused. Could you say that again?",
+        "max_retries": "I'm sorry, I'm having a hard time responding right now. Maybe we can try again later?",
+    }
+
     def __init__(self, system_prompt: str, spotify_tool=None, spotify_enabled: bool = False):
         """
         Initialize conversation engine.
@@ -492,15 +502,7 @@ class ConversationEngine:
         Returns:
             User-friendly error message in Teddy's voice
         """
-        error_messages = {
-            "rate_limit": "I'm having trouble thinking right now. Maybe I need a little rest?",
-            "connection": "I can't seem to reach my thoughts right now. Can we try again in a moment?",
-            "api": "Something's not quite right with my thinking. Let's try that again!",
-            "unknown": "Oh dear, I got a bit confused. Could you say that again?",
-            "max_retries": "I'm sorry, I'm having a hard time responding right now. Maybe we can try again later?",
-        }
-
-        return error_messages.get(error_type, error_messages["unknown"])
+        return self.ERROR_RESPONSES.get(error_type, self.ERROR_RESPONSES["unknown"])
 
     @property
     def time_since_last_interaction(self) -> float:
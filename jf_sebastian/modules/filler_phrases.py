@@ -4,7 +4,9 @@ Pre-generates short phrases that play immediately while real response is prepare
 """
 
 import logging
+import os
 import random
+import re
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -13,12 +15,16 @@ import soundfile as sf
 
 logger = logging.getLogger(__name__)
 
+# filler_NN.wav, where NN is the 1-based index into the personality's phrases.
+_FILLER_NAME_RE = re.compile(r"^filler_(\d+)\.wav$")
+
 
 class FillerPhraseManager:
     """
     Catalogs pre-generated filler phrase audio files on disk and decodes one
     on demand. Reads happen during PROCESSING, not the real-time playback
-    path, so the few-ms NVMe decode is invisible to the user.
+    path, so the few-ms NVMe decode is invisible to the user. Each file is
+    decoded at most once; later picks reuse the cached float32 buffer.
     """
 
     def __init__(self, filler_dir: Path, filler_phrases: list[str], device_type: str):
@@ -33,6 +39,7 @@ class FillerPhraseManager:
         self.filler_dir = self.filler_base_dir / device_type
         self.filler_phrases = filler_phrases
         self.filler_entries: list[Tuple[Path, str]] = []
+        self._decoded: dict[Path, Tuple[np.ndarray, int]] = {}
         self._scan_filler_files()
 
     def _scan_filler_files(self):
@@ -41,20 +48,32 @@ class FillerPhraseManager:
             logger.warning(f"Run scripts/generate_fillers.py to create filler phrases for {self.device_type}")
             return
 
-        for filler_file in sorted(self.filler_dir.glob("filler_*.wav")):
-            try:
-                phrase_index = int(filler_file.stem.split('_')[1]) - 1
-                filler_text = self.filler_phrases[phrase_index] if 0 <= phrase_index < len(self.filler_phrases) else ""
-                self.filler_entries.append((filler_file, filler_text))
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Skipping malformed filler filename {filler_file.name}: {e}")
+        # One scandir pass; Path.glob would wrap and stat every entry
+        with os.scandir(self.filler_dir) as entries:
+            filler_names = [
+                entry.name for entry in entries
+                if entry.name.startswith("filler_") and entry.name.endswith(".wav")
+            ]
+
+        indexed_names = []
+        for filler_name in filler_names:
+            match = _FILLER_NAME_RE.match(filler_name)
+            if match is None:
+                logger.warning(f"Skipping malformed filler filename {filler_name}")
                 continue
+            indexed_names.append((int(match.group(1)) - 1, filler_name))
+
+        # Order by the parsed index (name breaks ties), so filler_10 follows filler_9
+        indexed_names.sort()
+        for phrase_index, filler_name in indexed_names:
+            filler_text = self.filler_phrases[phrase_index] if 0 <= phrase_index < len(self.filler_phrases) else ""
+            self.filler_entries.append((self.filler_dir / filler_name, filler_text))
 
         logger.info(f"Catalogued {len(self.filler_entries)} filler phrases for {self.device_type} (lazy-loaded)")
 
     def get_random_filler(self) -> Optional[Tuple[np.ndarray, int, str]]:
         """
-        Pick a random filler and load it from disk now.
+        Pick a random filler, decoding it from disk on its first use.
 
         Returns:
             Tuple of (stereo_audio, sample_rate, filler_text) or None if no fillers available
@@ -65,12 +84,18 @@ class FillerPhraseManager:
 
         filler_path, filler_text = random.choice(self.filler_entries)
 
+        cached = self._decoded.get(filler_path)
+        if cached is not None:
+            audio_data, sample_rate = cached
+            return audio_data, sample_rate, filler_text
+
         try:
             audio_data, sample_rate = sf.read(str(filler_path), dtype='float32')
         except Exception as e:
             logger.warning(f"Failed to load filler {filler_path.name}: {e}")
             return None
 
+        self._decoded[filler_path] = (audio_data, sample_rate)
         logger.debug(f"Loaded filler: {len(audio_data)} samples from {filler_path.name}, {filler_text[:50]}...")
         return audio_data, sample_rate, filler_text
 
@@ -4,11 +4,31 @@ Based on the original Teddy Ruxpin tape format.
 """
 
 import logging
+import re
+from functools import lru_cache
+
 import numpy as np
 from jf_sebastian.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared pyphen dictionary, loaded on first use (parsing it costs a file read)
+_pyphen_dic = None
+
+
+def _get_pyphen_dic():
+    global _pyphen_dic
+    if _pyphen_dic is None:
+        import pyphen
+        _pyphen_dic = pyphen.Pyphen(lang='en_US')
+    return _pyphen_dic
+
+
+@lru_cache(maxsize=4096)
+def _hyphenate(word: str) -> tuple[str, ...]:
+    """Split a word into pyphen syllables; memoized since speech repeats words."""
+    return tuple(_get_pyphen_dic().inserted(word, hyphen='|').split('|'))
+
 
 class PPMGenerator:
     """
@@ -43,8 +63,9 @@ class PPMGenerator:
         self.period_samples = int(self.PERIOD / 1_000_000 * sample_rate)
         self.pause_samples = int(self.PAUSE_DURATION / 1_000_000 * sample_rate)
 
-        # Cached pyphen dictionary (loaded lazily on first use)
-        self._pyphen_dic = None
+        # Gap length in samples for each of the 256 possible channel values
+        gap_duration_us = self.MIN_GAP + (np.arange(256) / 255.0) * (self.MAX_GAP - self.MIN_GAP)
+        self._gap_samples_lut = (gap_duration_us / 1_000_000 * sample_rate).astype(np.int64)
 
         logger.info(f"PPM Generator initialized: {sample_rate}Hz, period={self.period_samples} samples")
 
@@ -63,43 +84,24 @@ class PPMGenerator:
         total_samples = int(duration_seconds * self.sample_rate)
         signal = np.zeros(total_samples, dtype=np.float32)
 
-        num_frames = len(channel_values)
-        sample_idx = 0
-
-        for frame_idx in range(num_frames):
-            if sample_idx >= total_samples:
-                break
-
-            frame_start = sample_idx
-
-            # Generate 8 channels for this frame
-            for ch in range(self.NUM_CHANNELS):
-                if sample_idx >= total_samples:
-                    break
-
-                # Get channel value (0-255)
-                value = channel_values[frame_idx, ch]
-
-                # Calculate gap duration based on value
-                gap_duration_us = self.MIN_GAP + (value / 255.0) * (self.MAX_GAP - self.MIN_GAP)
-                gap_samples = int(gap_duration_us / 1_000_000 * self.sample_rate)
-
-                # HIGH pulse - negative going, centered at DC=0 (matches original tapes)
-                pulse_end = min(sample_idx + self.pause_samples, total_samples)
-                signal[sample_idx:pulse_end] = -0.30  # HIGH pulse (negative, 30% amplitude like original)
-                sample_idx = pulse_end
-
-                # Gap at DC center (0.0 = silence)
-                gap_end = min(sample_idx + gap_samples, total_samples)
-                signal[sample_idx:gap_end] = 0.0  # Gap (DC center)
-                sample_idx = gap_end
-
-            # Fill rest of frame period with DC offset (sync gap)
-            frame_end = min(frame_start + self.period_samples, total_samples)
-            if sample_idx < frame_end:
-                signal[sample_idx:frame_end] = 0.0  # Sync gap at DC
-
-            sample_idx = frame_end
+        # Gap samples for every (frame, channel) at once. Coerce to in-range
+        # integer indices so float or out-of-range input still maps into the LUT.
+        values = np.clip(np.asarray(channel_values)[:, :self.NUM_CHANNELS], 0, 255).astype(np.intp)
+        gap_samples = self._gap_samples_lut[values]
+
+        # Each channel is a HIGH pulse followed by its gap. Even at max gap the 8
+        # channels take 8 * (400 + 1590)us = 15.92ms < 16.6ms, so frame f always
+        # starts at f * period_samples and channel c's pulse follows c pulses
+        # plus the gaps before it.
+        preceding_gaps = np.cumsum(gap_samples, axis=1) - gap_samples
+        channel_offsets = np.arange(values.shape[1]) * self.pause_samples + preceding_gaps
+        frame_starts = np.arange(len(values), dtype=np.int64)[:, None] * self.period_samples
+        pulse_starts = (frame_starts + channel_offsets).ravel()
+
+        # HIGH pulse - negative going, centered at DC=0 (matches original tapes).
+        # Gaps and the sync gap stay at DC center; anything past the end is dropped.
+        pulse_samples = (pulse_starts[:, None] + np.arange(self.pause_samples)).ravel()
+        signal[pulse_samples[pulse_samples < total_samples]] = -0.30  # 30% amplitude like original
 
         # Apply light low-pass filter to round pulse edges slightly
         # Original tapes have ~0.6ms rise time, but too much filtering creates glitchy motor behavior
@@ -138,9 +140,9 @@ class PPMGenerator:
         duration = len(audio) / sample_rate
         num_frames = int(duration / (self.PERIOD / 1_000_000)) + 1
 
-        # Initialize channel values (all zeros)
-        channel_values = np.zeros((num_frames, self.NUM_CHANNELS), dtype=np.uint8)
-        frames_generated = 0
+        # Initialize channel values (all zeros). Column-major, since channels are
+        # filled and read back a whole column at a time.
+        channel_values = np.zeros((num_frames, self.NUM_CHANNELS), dtype=np.uint8, order='F')
         blink_count = 0
 
         # Blink state tracking
@@ -152,13 +154,24 @@ class PPMGenerator:
         BLINK_HOLD_FRAMES = 3    # Frames to hold closed (~50ms)
         BLINK_OPEN_FRAMES = 8    # Frames to reopen (~133ms)
 
-        # Parse syllables from text for better lip sync timing
-        syllable_values = self._calculate_syllable_mouth_values(audio, sample_rate, text)
+        # Parse syllables from text for better lip sync timing. Silent audio closes
+        # every syllable's envelope whatever the text says, so skip the parsing
+        # there (the mouth stays shut; the eyes still animate below).
+        if not np.any(audio) and re.search(r'\w', text):
+            syllable_values = np.zeros(1)
+        else:
+            syllable_values = self._calculate_syllable_mouth_values(audio, sample_rate, text)
 
         # Clamp inputs for eyes and sentiment
-        base_eye_position = np.clip(eyes_base, 0, 1)
+        base_eye_position = float(np.clip(eyes_base, 0, 1))
         sentiment = float(np.clip(sentiment, -1.0, 1.0))
 
+        # Target position based on sentiment (very subtle ±3%), and the floor on
+        # eye openness when not blinking (relaxed from 75% to allow more range).
+        # Both are fixed for the whole clip.
+        target_eye_position = min(max(base_eye_position + sentiment * 0.03, 0.0), 1.0)
+        min_eye_open = max(base_eye_position * 0.85, 0.75)  # Keep eyes mostly open
+
         # Eye smoothing for sentiment-based movement
         current_eye_position = base_eye_position  # Start at base position
         EYE_SMOOTHING = 0.92  # Higher = smoother (0.9-0.95 range works well)
@@ -171,46 +184,33 @@ class PPMGenerator:
         # Samples per PPM frame
         samples_per_frame = int(sample_rate * self.PERIOD / 1_000_000)
 
-        # Generate mouth movements based on syllable timing
-        for frame_idx in range(num_frames):
-            start_sample = frame_idx * samples_per_frame
-            end_sample = min(start_sample + samples_per_frame, len(audio))
-
-            if start_sample >= len(audio):
-                break
-            frames_generated += 1
-
-            # Get syllable-based mouth value for this frame's timestamp
-            time_in_audio = start_sample / sample_rate
-            syllable_idx = int(time_in_audio / duration * len(syllable_values))
-            syllable_idx = min(syllable_idx, len(syllable_values) - 1)
-
-            mouth_value = syllable_values[syllable_idx]
+        # Only frames that start inside the audio are generated
+        if len(audio) == 0:
+            frames_generated = 0
+        elif samples_per_frame > 0:
+            frames_generated = min(num_frames, -(-len(audio) // samples_per_frame))
+        else:
+            frames_generated = num_frames
 
-            # Apply smooth interpolation between syllables
-            if frame_idx > 0:
-                prev_mouth = channel_values[frame_idx - 1, 3] / 255.0
-                # Fast attack on syllable start, slower release
-                if mouth_value > prev_mouth:
-                    attack = 0.15  # Fast attack for syllable onset
-                    mouth_value = attack * prev_mouth + (1 - attack) * mouth_value
-                else:
-                    release = 0.35  # Moderate release between syllables
-                    mouth_value = release * prev_mouth + (1 - release) * mouth_value
+        # Syllable-based mouth target for every frame's timestamp in one pass
+        if frames_generated > 0:
+            time_in_audio = np.arange(frames_generated) * samples_per_frame / sample_rate
+            syllable_idx = (time_in_audio / duration * len(syllable_values)).astype(np.intp)
+            frame_mouth_targets = syllable_values[np.minimum(syllable_idx, len(syllable_values) - 1)]
 
-            channel_values[frame_idx, 3] = int(mouth_value * 255)  # Ch3: Lower jaw/mouth
-            channel_values[frame_idx, 2] = int(mouth_value * 0.7 * 255)  # Ch2: Upper jaw (70% of lower)
+            mouth = self._smooth_mouth_values(frame_mouth_targets)
+            channel_values[:frames_generated, 3] = mouth * 255  # Ch3: Lower jaw/mouth
+            channel_values[:frames_generated, 2] = mouth * 0.7 * 255  # Ch2: Upper jaw (70% of lower)
 
+        # Eyes and blinks per frame, as plain floats; written as one column below
+        eye_positions = [0.0] * frames_generated
+        for frame_idx in range(frames_generated):
             # Eye control based on sentiment (smoothed over time to avoid jerky movement)
             if frame_idx < settle_frames_start or frame_idx >= settle_end_start_idx:
                 # Force initial and final frames to the base position to reset between interactions
                 eye_position = base_eye_position
                 current_eye_position = base_eye_position  # Reset smoothing
             else:
-                # Calculate target position based on sentiment (very subtle ±3%)
-                target_eye_position = base_eye_position + sentiment * 0.03
-                target_eye_position = np.clip(target_eye_position, 0, 1)
-
                 # Smooth transition using exponential moving average
                 # This creates gradual movement instead of instant jumps
                 current_eye_position = EYE_SMOOTHING * current_eye_position + (1 - EYE_SMOOTHING) * target_eye_position
@@ -259,15 +259,16 @@ class PPMGenerator:
                     blink_state = None  # Blink complete
                     blink_frame_counter = 0
 
-            # Keep a floor on eye openness when not blinking (relaxed from 75% to allow more range)
+            # Keep a floor on eye openness when not blinking
             if blink_state is None:
-                min_eye_open = max(base_eye_position * 0.85, 0.75)  # Keep eyes mostly open
                 eye_position = max(eye_position, min_eye_open)
 
-            # Hardware expects inverted polarity: higher command closes lids, so flip to keep
-            # higher logical openness mapping to lower command value.
-            eye_command = 1.0 - eye_position
-            channel_values[frame_idx, 1] = int(eye_command * 255)  # Ch1: Eyes (inverted)
+            eye_positions[frame_idx] = eye_position
+
+        # Hardware expects inverted polarity: higher command closes lids, so flip to keep
+        # higher logical openness mapping to lower command value.
+        eye_commands = 1.0 - np.array(eye_positions)
+        channel_values[:frames_generated, 1] = eye_commands * 255  # Ch1: Eyes (inverted)
 
         # Trim to the frames we actually generated (avoids trailing zeros from the prealloc)
         if frames_generated > 0:
@@ -321,6 +322,38 @@ class PPMGenerator:
 
         return channel_values
 
+    @staticmethod
+    def _smooth_mouth_values(targets: np.ndarray) -> np.ndarray:
+        """
+        Smooth per-frame mouth targets with a fast attack and moderate release.
+
+        The coefficient depends on whether the mouth is opening or closing, and
+        each step starts from the previous frame's 8-bit command, so this is not
+        a linear filter; it runs as a scalar loop over plain Python floats.
+
+        Args:
+            targets: Syllable-based mouth value (0-1) for each frame
+
+        Returns:
+            Smoothed mouth values (0-1), one per frame
+        """
+        smoothed = np.empty(len(targets))
+        prev_mouth = None
+        for frame_idx, mouth_value in enumerate(targets.tolist()):
+            # Apply smooth interpolation between syllables
+            if prev_mouth is not None:
+                # Fast attack on syllable start, slower release
+                if mouth_value > prev_mouth:
+                    attack = 0.15  # Fast attack for syllable onset
+                    mouth_value = attack * prev_mouth + (1 - attack) * mouth_value
+                else:
+                    release = 0.35  # Moderate release between syllables
+                    mouth_value = release * prev_mouth + (1 - release) * mouth_value
+
+            smoothed[frame_idx] = mouth_value
+            prev_mouth = int(mouth_value * 255) / 255.0  # As sent on the lower-jaw channel
+        return smoothed
+
     def _calculate_syllable_mouth_values(
         self,
         audio: np.ndarray,
@@ -342,7 +375,6 @@ class PPMGenerator:
             Array of mouth values (0-1) creating envelopes for each syllable
         """
         import syllables
-        import re
 
         # Clean text and extract syllables
         words = re.findall(r'\b\w+\b', text.lower())
@@ -363,43 +395,32 @@ class PPMGenerator:
         samples_per_syllable = len(audio) // total_syllables if total_syllables > 0 else len(audio)
 
         # Create envelope values: 3 points per syllable (start, peak, end)
-        envelope_values = []
-
-        for syl_idx in range(total_syllables):
-            start_sample = syl_idx * samples_per_syllable
-            end_sample = min(start_sample + samples_per_syllable, len(audio))
-
-            if start_sample >= len(audio):
-                envelope_values.extend([0.0, 0.0, 0.0])
-                continue
-
-            # Get audio for this syllable
-            syllable_audio = audio[start_sample:end_sample]
-
-            if len(syllable_audio) == 0:
-                envelope_values.extend([0.0, 0.0, 0.0])
-                continue
-
-            # Calculate amplitude for this syllable (peak + RMS blend)
-            peak = np.max(np.abs(syllable_audio))
-            rms = np.sqrt(np.mean(syllable_audio ** 2))
+        envelope = np.zeros((total_syllables, 3))
+
+        # Each syllable gets an equal, full-length segment; leftover tail samples
+        # are ignored. With fewer samples than syllables every segment is empty
+        # and the whole envelope stays closed.
+        if samples_per_syllable > 0:
+            segments = audio[:total_syllables * samples_per_syllable].reshape(total_syllables, samples_per_syllable)
+
+            # Calculate amplitude for each syllable (peak + RMS blend). The |x|
+            # buffer is squared in place for the RMS rather than allocating x**2.
+            magnitude = np.abs(segments)
+            peak = np.max(magnitude, axis=1)
+            rms = np.sqrt(np.mean(np.square(magnitude, out=magnitude), axis=1))
             amplitude = 0.7 * peak + 0.3 * rms
 
-            # Apply gain for mouth movement (scaled for visibility)
-            mouth_opening = np.clip(amplitude * 12.0, 0, 1)
+            # Apply gain for mouth movement (scaled for visibility); the envelope
+            # is closed → open (amplitude-based) → closed
+            envelope[:, 1] = np.clip(amplitude * 12.0, 0, 1)
 
-            # Create envelope: closed → open → closed
-            envelope_values.extend([
-                0.0,              # Start: closed
-                mouth_opening,    # Middle: open (amplitude-based)
-                0.0               # End: closed
-            ])
+        envelope_values = envelope.ravel()
 
         logger.debug(
             f"Generated {len(envelope_values)} envelope values from {total_syllables} syllables"
         )
 
-        return np.array(envelope_values)
+        return envelope_values
 
     def _extract_syllables_from_text(self, words: list) -> list:
         """
@@ -412,19 +433,8 @@ class PPMGenerator:
             List of syllable strings
         """
         try:
-            import pyphen
-            if self._pyphen_dic is None:
-                self._pyphen_dic = pyphen.Pyphen(lang='en_US')
-            dic = self._pyphen_dic
-
-            syllable_list = []
-            for word in words:
-                # Split word into syllables using pyphen
-                syllabified = dic.inserted(word, hyphen='|')
-                word_syllables = syllabified.split('|')
-                syllable_list.extend(word_syllables)
-
-            return syllable_list
+            # Split each word into syllables using pyphen
+            return [syllable for word in words for syllable in _hyphenate(word)]
 
         except Exception as e:
             logger.warning(f"Error extracting syllables with pyphen: {e}, using fallback")
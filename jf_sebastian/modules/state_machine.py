@@ -6,6 +6,7 @@ States: IDLE, LISTENING, PROCESSING, SPEAKING
 import logging
 import time
 import threading
+from collections import deque
 from enum import Enum
 from typing import Optional, Callable
 from dataclasses import dataclass
@@ -16,15 +17,35 @@ logger = logging.getLogger(__name__)
 
 class ConversationState(Enum):
     """Conversation states for the Teddy Ruxpin system."""
-    IDLE = "idle"
-    LISTENING = "listening"
-    PROCESSING = "processing"
-    SPEAKING = "speaking"
+    IDLE = ("idle", 0)
+    LISTENING = ("listening", 1)
+    PROCESSING = ("processing", 2)
+    SPEAKING = ("speaking", 3)
 
+    def __new__(cls, value: str, idx: int):
+        # `.value` stays the plain string; `.idx` gives each member a dense
+        # integer position so per-state tables can be tuples/lists instead
+        # of dicts (Enum.__hash__ is a Python-level call).
+        member = object.__new__(cls)
+        member._value_ = value
+        member.idx = idx
+        return member
 
-@dataclass
+
+# Module-level aliases for the transition hot path: on Python 3.10 each
+# `ConversationState.X` goes through EnumMeta.__getattr__, a global does not.
+_IDLE = ConversationState.IDLE
+_LISTENING = ConversationState.LISTENING
+
+
+@dataclass(slots=True, frozen=True)
 class StateTransition:
-    """Represents a state transition event."""
+    """Represents a state transition event.
+
+    `timestamp` is a `time.monotonic()` reading, not epoch seconds: compare it
+    only with other monotonic values (e.g. `time.monotonic() - t.timestamp`),
+    never with `time.time()` or datetimes.
+    """
     from_state: ConversationState
     to_state: ConversationState
     timestamp: float
@@ -46,36 +67,61 @@ class StateMachine:
         ConversationState.SPEAKING: [ConversationState.LISTENING, ConversationState.IDLE],
     }
 
+    # Validity matrix indexed by [from_state.idx][to_state.idx], so checking a
+    # transition is two tuple indexes with no hashing. Same-state
+    # "transitions" are allowed as no-ops.
+    _VALID_MATRIX = tuple(
+        tuple(to_state is from_state or to_state in targets for to_state in ConversationState)
+        for from_state, targets in sorted(VALID_TRANSITIONS.items(), key=lambda item: item[0].idx)
+    )
+
+    # Fixed part of __repr__ per state; only the idle duration is formatted per call.
+    _REPR_PREFIX = {
+        state: f"StateMachine(state={state.value}, idle_duration=" for state in ConversationState
+    }
+
     def __init__(self):
         self._state: ConversationState = ConversationState.IDLE
         self._lock = threading.Lock()
-        self._callbacks: dict[ConversationState, list[Callable]] = {
-            state: [] for state in ConversationState
-        }
-        self._transition_history: list[StateTransition] = []
+        # Copy-on-write: registration swaps in a new tuple, so firing callbacks
+        # can iterate a snapshot without copying or holding the lock.
+        # Indexed by ConversationState.idx.
+        self._callbacks: list[tuple[Callable, ...]] = [() for _ in ConversationState]
         self._max_history: int = 100
-        self._last_activity_time: float = time.time()
-        self._last_transition_time: float = time.time()
+        self._transition_history: deque[StateTransition] = deque(maxlen=self._max_history)
+        # Durations use the monotonic clock so wall-clock adjustments (NTP,
+        # DST) can't produce negative or inflated idle times.
+        now = time.monotonic()
+        self._last_activity_time: float = now
+        self._last_transition_time: float = now
         self._conversation_start_time: Optional[float] = None
 
         logger.info("State machine initialized in IDLE state")
 
     @property
     def state(self) -> ConversationState:
-        """Get current state (thread-safe)."""
-        with self._lock:
-            return self._state
+        """Get current state (thread-safe).
+
+        A single attribute read is atomic, so readers don't take the lock;
+        only writers serialize on it.
+        """
+        return self._state
 
     @property
     def last_activity_time(self) -> float:
-        """Get timestamp of last activity."""
+        """Get timestamp of last activity (`time.monotonic()` clock)."""
         with self._lock:
             return self._last_activity_time
 
     @property
     def idle_duration(self) -> float:
         """Get seconds since last activity."""
-        return time.time() - self.last_activity_time
+        return time.monotonic() - self.last_activity_time
+
+    @property
+    def time_in_state(self) -> float:
+        """Get seconds since the last state transition."""
+        return time.monotonic() - self._last_transition_time
 
     @property
     def conversation_duration(self) -> Optional[float]:
@@ -83,7 +129,7 @@ class StateMachine:
         with self._lock:
             if self._conversation_start_time is None:
                 return None
-            return time.time() - self._conversation_start_time
+            return time.monotonic() - self._conversation_start_time
 
     def try_transition(
         self,
@@ -101,10 +147,12 @@ class StateMachine:
         with self._lock:
             if self._state != expected_state:
                 return False
-            applied = self._apply_transition_locked(new_state, trigger)
-        if applied:
-            self._execute_callbacks(new_state)
-        return applied
+            record = self._apply_transition_locked(new_state, trigger)
+        if record is None:
+            return False
+        self._log_transition(record)
+        self._execute_callbacks(new_state)
+        return True
 
     def transition_to(self, new_state: ConversationState, trigger: str = "manual") -> bool:
         """
@@ -118,60 +166,63 @@ class StateMachine:
             True if transition was successful, False if invalid
         """
         with self._lock:
-            applied = self._apply_transition_locked(new_state, trigger)
-        if applied:
-            # Execute callbacks outside of lock to prevent deadlock
-            self._execute_callbacks(new_state)
-        return applied
+            record = self._apply_transition_locked(new_state, trigger)
+        if record is None:
+            return False
+        # Log and execute callbacks outside of lock to prevent deadlock
+        self._log_transition(record)
+        self._execute_callbacks(new_state)
+        return True
 
     def _apply_transition_locked(
         self, new_state: ConversationState, trigger: str
-    ) -> bool:
+    ) -> Optional[StateTransition]:
         """Validate, mutate, and record the transition. Caller must hold `_lock`.
-        Returns True if the transition was applied."""
+        Returns the recorded transition, or None if it was rejected."""
         old_state = self._state
         if not self._is_valid_transition(old_state, new_state):
             logger.warning(
                 f"Invalid state transition: {old_state.value} -> {new_state.value} "
                 f"(trigger: {trigger})"
             )
-            return False
+            return None
 
         self._state = new_state
-        now = time.time()
+        now = time.monotonic()
         self._last_activity_time = now
         self._last_transition_time = now
 
         # Track conversation session boundaries.
-        if new_state == ConversationState.LISTENING and old_state == ConversationState.IDLE:
+        if new_state is _LISTENING and old_state is _IDLE:
             self._conversation_start_time = now
-            logger.info("New conversation session started")
-        elif new_state == ConversationState.IDLE:
+        elif new_state is _IDLE:
             self._conversation_start_time = None
-            logger.info("Conversation session ended")
 
-        # Record transition (cap history to prevent unbounded growth)
-        self._transition_history.append(StateTransition(
+        # Record transition (the deque's maxlen evicts the oldest entries)
+        record = StateTransition(
             from_state=old_state,
             to_state=new_state,
             timestamp=now,
             trigger=trigger,
-        ))
-        if len(self._transition_history) > self._max_history:
-            self._transition_history = self._transition_history[-self._max_history:]
+        )
+        self._transition_history.append(record)
+        return record
 
+    @staticmethod
+    def _log_transition(record: StateTransition):
+        """Log an applied transition. Called after `_lock` is released."""
+        if record.to_state is _LISTENING and record.from_state is _IDLE:
+            logger.info("New conversation session started")
+        elif record.to_state is _IDLE:
+            logger.info("Conversation session ended")
         logger.info(
-            f"State transition: {old_state.value} -> {new_state.value} (trigger: {trigger})"
+            f"State transition: {record.from_state.value} -> {record.to_state.value} "
+            f"(trigger: {record.trigger})"
         )
-        return True
 
     def _is_valid_transition(self, from_state: ConversationState, to_state: ConversationState) -> bool:
         """Check if a state transition is valid."""
-        # Allow same-state "transitions" (no-op)
-        if from_state == to_state:
-            return True
-
-        return to_state in self.VALID_TRANSITIONS.get(from_state, [])
+        return self._VALID_MATRIX[from_state.idx][to_state.idx]
 
     def register_callback(self, state: ConversationState, callback: Callable):
         """
@@ -182,13 +233,12 @@ class StateMachine:
             callback: Function to call (should be non-blocking or threaded)
         """
         with self._lock:
-            self._callbacks[state].append(callback)
+            self._callbacks[state.idx] = self._callbacks[state.idx] + (callback,)
         logger.debug(f"Registered callback for state: {state.value}")
 
     def _execute_callbacks(self, state: ConversationState):
         """Execute all callbacks for a given state."""
-        callbacks = self._callbacks[state].copy()
-        for callback in callbacks:
+        for callback in self._callbacks[state.idx]:
             try:
                 callback()
             except Exception as e:
@@ -197,12 +247,12 @@ class StateMachine:
     def reset_activity_timer(self):
         """Reset the activity timer (useful for extending timeout periods)."""
         with self._lock:
-            self._last_activity_time = time.time()
+            self._last_activity_time = time.monotonic()
 
     def get_transition_history(self, limit: int = 10) -> list[StateTransition]:
         """Get recent state transitions."""
         with self._lock:
-            return self._transition_history[-limit:]
+            return list(self._transition_history)[-limit:]
 
     def clear_history(self):
         """Clear transition history (useful for debugging/testing)."""
@@ -211,4 +261,4 @@ class StateMachine:
         logger.debug("Transition history cleared")
 
     def __repr__(self) -> str:
-        return f"StateMachine(state={self.state.value}, idle_duration={self.idle_duration:.1f}s)"
+        return f"{self._REPR_PREFIX[self._state]}{self.idle_duration:.1f}s)"
@@ -3,10 +3,15 @@ Base personality class and YAML loader for animatronic characters.
 Personalities are defined in personality.yaml files within each personality directory.
 """
 
+import os
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import List, Optional
-import yaml
+
+# Keys every personality.yaml must define, in the order they are reported.
+_REQUIRED_FIELDS = ('name', 'tts_voice', 'wake_word_model', 'system_prompt', 'filler_phrases')
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
 
 
 @dataclass
@@ -84,9 +89,9 @@ class Personality:
         """Get full paths to wake word model files"""
         return [self.personality_dir / self.wake_word_model]
 
-    @property
+    @cached_property
     def filler_audio_dir(self) -> Path:
-        """Directory containing pre-generated filler audio files"""
+        """Directory containing pre-generated filler audio files (computed once per instance)"""
         return self.personality_dir / "filler_audio"
 
     @property
@@ -141,7 +146,7 @@ class Personality:
 
     def get_description(self) -> str:
         """Get a human-readable description of this personality"""
-        first_sentence = self.system_prompt.split('.')[0] if self.system_prompt else ""
+        first_sentence = self.system_prompt.partition('.')[0] if self.system_prompt else ""
         return f"{self.name} - {first_sentence}"
 
 
@@ -164,14 +169,20 @@ def load_personality_from_yaml(personality_dir: Path) -> Personality:
     if not yaml_path.exists():
         raise FileNotFoundError(f"No personality.yaml found in {personality_dir}")
 
+    # Imported here so directory-only callers (discover_personalities,
+    # list_personalities) don't pay PyYAML's import cost.
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     with open(yaml_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=loader)
 
-    # Validate required fields
-    required_fields = ['name', 'tts_voice', 'wake_word_model', 'system_prompt', 'filler_phrases']
-    missing_fields = [field for field in required_fields if field not in data]
+    # Validate required fields (one set difference; ordering only on the error path)
+    missing = _REQUIRED_FIELD_SET.difference(data)
 
-    if missing_fields:
+    if missing:
+        missing_fields = [name for name in _REQUIRED_FIELDS if name in missing]
         raise ValueError(
             f"personality.yaml in {personality_dir} is missing required fields: "
             f"{', '.join(missing_fields)}"
@@ -271,16 +282,19 @@ def discover_personalities(personalities_root: Path) -> dict[str, Path]:
     """
     personalities = {}
 
-    if not personalities_root.exists():
+    try:
+        entries = os.scandir(personalities_root)
+    except FileNotFoundError:
         return personalities
 
-    # Look for subdirectories containing personality.yaml
-    for item in personalities_root.iterdir():
-        if item.is_dir() and not item.name.startswith(('_', '.')):
-            yaml_file = item / "personality.yaml"
-            if yaml_file.exists():
+    # Look for subdirectories containing personality.yaml. DirEntry.is_dir()
+    # uses the type readdir already returned, so only the yaml check stats.
+    with entries:
+        for entry in entries:
+            if entry.name.startswith(('_', '.')) or not entry.is_dir():
+                continue
+            if os.path.exists(os.path.join(entry.path, "personality.yaml")):
                 # Use folder name as personality key
-                personality_key = item.name.lower()
-                personalities[personality_key] = item
+                personalities[entry.name.lower()] = personalities_root / entry.name
 
     return personalities
@@ -119,6 +119,17 @@ def sample_ppm_channel_values():
     return channels
 
 
+@pytest.fixture(scope="session")
+def ppm16k():
+    """One 16 kHz PPMGenerator shared by the session.
+
+    It holds no per-call state; tests that patch methods on the instance
+    should build their own.
+    """
+    from jf_sebastian.modules.ppm_generator import PPMGenerator
+    return PPMGenerator(sample_rate=16000)
+
+
 @pytest.fixture
 def mock_personality():
     """Mock personality instance."""
@@ -2,13 +2,13 @@
 Tests for conversation engine module.
 """
 
+import copy
 import pytest
 import time
-from unittest.mock import Mock, MagicMock, patch
-from collections import deque
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from jf_sebastian.modules.conversation import ConversationEngine, MockConversationEngine
-from openai import APIError, APIConnectionError, RateLimitError
 
 
 # MockConversationEngine Tests
@@ -20,92 +20,99 @@ def test_mock_conversation_engine_initialization():
     assert engine._interaction_count == 0
 
 
-def test_mock_conversation_engine_generate_response():
-    """Test mock response generation."""
+def test_mock_conversation_engine_lifecycle():
+    """Drive one mock engine through every operation in sequence."""
     engine = MockConversationEngine()
 
-    response = engine.generate_response("Hello")
-
-    assert response is not None
-    assert isinstance(response, str)
-    assert len(response) > 0
-
-
-def test_mock_conversation_engine_empty_input():
-    """Test mock engine with empty input."""
-    engine = MockConversationEngine()
-
-    response = engine.generate_response("")
-
-    assert response is None
-
-
-def test_mock_conversation_engine_cycles_responses():
-    """Test that mock engine cycles through responses."""
-    engine = MockConversationEngine()
-
-    responses = []
-    for i in range(8):  # More than 4 to test cycling
-        response = engine.generate_response(f"Question {i}")
-        responses.append(response)
-
-    # Should cycle through 4 responses
-    assert len(set(responses)) == 4
-    assert responses[0] == responses[4]
-
-
-def test_mock_conversation_engine_retry():
-    """Test mock engine retry method."""
-    engine = MockConversationEngine()
+    assert engine.time_since_last_interaction == 0.0
+    assert engine.get_history() == []
 
-    response = engine.generate_response_with_retry("Hello", max_retries=3)
+    # Empty input is ignored and doesn't count as an interaction
+    assert engine.generate_response("") is None
+    assert engine.get_history_length() == 0
 
-    assert response is not None
+    response = engine.generate_response("Hello")
     assert isinstance(response, str)
+    assert len(response) > 0
 
-
-def test_mock_conversation_engine_clear_history():
-    """Test clearing mock history."""
-    engine = MockConversationEngine()
-
-    engine.generate_response("Test 1")
-    engine.generate_response("Test 2")
-
-    assert engine._interaction_count == 2
+    retry_response = engine.generate_response_with_retry("Hello", max_retries=3)
+    assert isinstance(retry_response, str)
+    assert engine.get_history_length() == 2
 
     engine.clear_history()
-
     assert engine._interaction_count == 0
 
+    # Cycles through 4 responses
+    responses = [engine.generate_response(f"Question {i}") for i in range(8)]
+    assert len(set(responses)) == 4
+    assert responses[0] == responses[4]
+    assert engine.get_history() == []
 
-def test_mock_conversation_engine_get_history():
-    """Test getting mock history."""
-    engine = MockConversationEngine()
-
-    history = engine.get_history()
 
-    assert isinstance(history, list)
-    assert len(history) == 0
+# ConversationEngine Tests with Mocking
 
+def make_completion(content):
+    """A chat-completions response whose first choice carries ``content``."""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def wire(mock_openai, *, returns=None, raises=None):
+    """Point the patched ``OpenAI`` at a client whose create() returns or raises.
+
+    ``raises`` is passed straight through as ``side_effect``, so a list of
+    exceptions and responses plays out one item per call.
+    """
+    if (returns is None) == (raises is None):
+        raise ValueError("wire() takes exactly one of returns= or raises=")
+    client = MagicMock()
+    create = client.chat.completions.create
+    if raises is not None:
+        create.side_effect = raises
+    else:
+        create.return_value = returns
+    mock_openai.return_value = client
+    return client
+
+
+@pytest.fixture(scope="module")
+def openai_errors():
+    """OpenAI exceptions built once per module and reused as side effects.
+
+    The error tests only check the engine's reaction, never the exception
+    payload, so sharing one instance per type is safe.
+    """
+    from openai import APIError, APIConnectionError, RateLimitError
 
-def test_mock_conversation_engine_get_history_length():
-    """Test getting mock history length."""
-    engine = MockConversationEngine()
+    mock_response = MagicMock()
+    mock_response.request = MagicMock()
+    return SimpleNamespace(
+        rate_limit=RateLimitError("Rate limit", response=mock_response, body=None),
+        connection=APIConnectionError(request=None),
+        api=APIError("API Error", request=None, body=None),
+    )
 
-    engine.generate_response("Test 1")
-    engine.generate_response("Test 2")
 
-    assert engine.get_history_length() == 2
+@pytest.fixture(scope="module")
+def _engine_proto():
+    """One engine built under the default mocked settings, shared by the module."""
+    with patch('jf_sebastian.modules.conversation.OpenAI'), \
+            patch('jf_sebastian.modules.conversation.settings') as mock_settings:
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.MAX_HISTORY_LENGTH = 20
+        mock_settings.GPT_MODEL = "gpt-4o-mini"
+        return ConversationEngine("Test prompt")
 
 
-def test_mock_conversation_engine_time_since_interaction():
-    """Test time since interaction for mock."""
-    engine = MockConversationEngine()
+@pytest.fixture
+def engine(_engine_proto):
+    """A private copy of the prototype engine; cheaper than re-running __init__."""
+    fresh = copy.deepcopy(_engine_proto)
+    fresh._last_interaction_time = time.time()
+    return fresh
 
-    assert engine.time_since_last_interaction == 0.0
-
-
-# ConversationEngine Tests with Mocking
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
@@ -142,14 +149,7 @@ def test_conversation_engine_generate_response_success(mock_settings, mock_opena
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    # Mock OpenAI response
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "This is a test response."
-
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = mock_response
-    mock_openai.return_value = mock_client
+    mock_client = wire(mock_openai, returns=make_completion("This is a test response."))
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Hello, how are you?")
@@ -159,29 +159,15 @@ def test_conversation_engine_generate_response_success(mock_settings, mock_opena
     mock_client.chat.completions.create.assert_called_once()
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_empty_input(mock_settings, mock_openai):
+def test_conversation_engine_empty_input(engine):
     """Test response generation with empty input."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
     response = engine.generate_response("")
 
     assert response is None
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_whitespace_input(mock_settings, mock_openai):
+def test_conversation_engine_whitespace_input(engine):
     """Test response generation with whitespace-only input."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
     response = engine.generate_response("   ")
 
     assert response is None
@@ -196,13 +182,7 @@ def test_conversation_engine_with_context(mock_settings, mock_openai):
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "Response with context."
-
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = mock_response
-    mock_openai.return_value = mock_client
+    wire(mock_openai, returns=make_completion("Response with context."))
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Question?", additional_context="Hmm...")
@@ -217,20 +197,14 @@ def test_conversation_engine_with_context(mock_settings, mock_openai):
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_rate_limit_error(mock_settings, mock_openai):
+def test_conversation_engine_rate_limit_error(mock_settings, mock_openai, openai_errors):
     """Test handling of rate limit errors."""
     mock_settings.OPENAI_API_KEY = "test-key"
     mock_settings.MAX_HISTORY_LENGTH = 20
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    # Create a proper mock response object for RateLimitError
-    mock_response = MagicMock()
-    mock_response.request = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.side_effect = RateLimitError("Rate limit", response=mock_response, body=None)
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=openai_errors.rate_limit)
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Hello")
@@ -241,16 +215,14 @@ def test_conversation_engine_rate_limit_error(mock_settings, mock_openai):
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_connection_error(mock_settings, mock_openai):
+def test_conversation_engine_connection_error(mock_settings, mock_openai, openai_errors):
     """Test handling of connection errors."""
     mock_settings.OPENAI_API_KEY = "test-key"
     mock_settings.MAX_HISTORY_LENGTH = 20
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.side_effect = APIConnectionError(request=None)
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=openai_errors.connection)
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Hello")
@@ -261,16 +233,14 @@ def test_conversation_engine_connection_error(mock_settings, mock_openai):
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_api_error(mock_settings, mock_openai):
+def test_conversation_engine_api_error(mock_settings, mock_openai, openai_errors):
     """Test handling of generic API errors."""
     mock_settings.OPENAI_API_KEY = "test-key"
     mock_settings.MAX_HISTORY_LENGTH = 20
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.side_effect = APIError("API Error", request=None, body=None)
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=openai_errors.api)
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Hello")
@@ -288,9 +258,7 @@ def test_conversation_engine_unknown_error(mock_settings, mock_openai):
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.side_effect = Exception("Unknown error")
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=Exception("Unknown error"))
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response("Hello")
@@ -299,19 +267,13 @@ def test_conversation_engine_unknown_error(mock_settings, mock_openai):
     assert "confused" in response.lower()
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_clear_history(mock_settings, mock_openai):
+def test_conversation_engine_clear_history(engine):
     """Test clearing conversation history."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
-
     # Manually add turns
-    engine._messages.append({"role": "user", "content": "Test"})
-    engine._messages.append({"role": "assistant", "content": "Response"})
+    engine._messages.extend([
+        {"role": "user", "content": "Test"},
+        {"role": "assistant", "content": "Response"},
+    ])
 
     assert len(engine._messages) == 2
 
@@ -322,16 +284,8 @@ def test_conversation_engine_clear_history(mock_settings, mock_openai):
     assert engine.get_history() == [{"role": "system", "content": "Test prompt"}]
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_get_history(mock_settings, mock_openai):
+def test_conversation_engine_get_history(engine):
     """Test getting conversation history."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
-
     engine._messages.append({"role": "user", "content": "Test"})
 
     history = engine.get_history()
@@ -342,16 +296,8 @@ def test_conversation_engine_get_history(mock_settings, mock_openai):
     assert history[1]["role"] == "user"
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_get_history_length(mock_settings, mock_openai):
+def test_conversation_engine_get_history_length(engine):
     """Test getting history length."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
-
     assert engine.get_history_length() == 1  # Only system prompt
 
     engine._messages.append({"role": "user", "content": "Test"})
@@ -368,13 +314,7 @@ def test_conversation_engine_timeout_clears_history(mock_settings, mock_openai):
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 0.1  # Very short timeout
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "Response"
-
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = mock_response
-    mock_openai.return_value = mock_client
+    wire(mock_openai, returns=make_completion("Response"))
 
     engine = ConversationEngine("Test prompt")
 
@@ -401,13 +341,7 @@ def test_conversation_engine_time_since_interaction(mock_settings, mock_openai):
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "Response"
-
-    mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = mock_response
-    mock_openai.return_value = mock_client
+    wire(mock_openai, returns=make_completion("Response"))
 
     engine = ConversationEngine("Test prompt")
 
@@ -425,29 +359,16 @@ def test_conversation_engine_time_since_interaction(mock_settings, mock_openai):
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_generate_response_with_retry_success(mock_settings, mock_openai):
+def test_conversation_engine_generate_response_with_retry_success(mock_settings, mock_openai, openai_errors):
     """Test retry mechanism with eventual success."""
     mock_settings.OPENAI_API_KEY = "test-key"
     mock_settings.MAX_HISTORY_LENGTH = 20
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    # Create mock responses - first returns rate limit error (triggers retry), second succeeds
-    mock_response = MagicMock()
-    mock_response.request = MagicMock()
-
-    success_response = MagicMock()
-    success_response.choices = [MagicMock()]
-    success_response.choices[0].message.content = "Success response"
-
-    mock_client = MagicMock()
     # First call: RateLimitError (returns "I'm having trouble..." which triggers retry)
     # Second call: Success
-    mock_client.chat.completions.create.side_effect = [
-        RateLimitError("Rate limit", response=mock_response, body=None),
-        success_response
-    ]
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=[openai_errors.rate_limit, make_completion("Success response")])
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response_with_retry("Test", max_retries=3)
@@ -457,21 +378,15 @@ def test_conversation_engine_generate_response_with_retry_success(mock_settings,
 
 @patch('jf_sebastian.modules.conversation.OpenAI')
 @patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_generate_response_with_retry_all_fail(mock_settings, mock_openai):
+def test_conversation_engine_generate_response_with_retry_all_fail(mock_settings, mock_openai, openai_errors):
     """Test retry mechanism when all attempts fail."""
     mock_settings.OPENAI_API_KEY = "test-key"
     mock_settings.MAX_HISTORY_LENGTH = 20
     mock_settings.GPT_MODEL = "gpt-4o-mini"
     mock_settings.CONVERSATION_TIMEOUT = 300
 
-    # Create mock response for RateLimitError
-    mock_response = MagicMock()
-    mock_response.request = MagicMock()
-
-    mock_client = MagicMock()
     # All attempts return RateLimitError (which triggers retries)
-    mock_client.chat.completions.create.side_effect = RateLimitError("Always fail", response=mock_response, body=None)
-    mock_openai.return_value = mock_client
+    wire(mock_openai, raises=openai_errors.rate_limit)
 
     engine = ConversationEngine("Test prompt")
     response = engine.generate_response_with_retry("Test", max_retries=2)
@@ -490,40 +405,24 @@ def test_conversation_engine_max_history_length(mock_settings, mock_openai):
 
     engine = ConversationEngine("Test prompt")
 
-    # Add many messages
-    for i in range(10):
-        engine._messages.append({"role": "user", "content": f"Message {i}"})
+    # Add many messages in one bulk insert
+    engine._messages.extend({"role": "user", "content": f"Message {i}"} for i in range(10))
 
     # Should be limited to max length
     assert len(engine._messages) <= 5
 
 
-@patch('jf_sebastian.modules.conversation.OpenAI')
-@patch('jf_sebastian.modules.conversation.settings')
-def test_conversation_engine_error_response_types(mock_settings, mock_openai):
+def test_conversation_engine_error_response_types(engine):
     """Test different error response types."""
-    mock_settings.OPENAI_API_KEY = "test-key"
-    mock_settings.MAX_HISTORY_LENGTH = 20
-    mock_settings.GPT_MODEL = "gpt-4o-mini"
-
-    engine = ConversationEngine("Test prompt")
-
-    # Test each error type
-    rate_limit_msg = engine._get_error_response("rate_limit")
-    assert "trouble thinking" in rate_limit_msg.lower()
-
-    connection_msg = engine._get_error_response("connection")
-    assert "reach my thoughts" in connection_msg.lower()
-
-    api_msg = engine._get_error_response("api")
-    assert "not quite right" in api_msg.lower()
-
-    unknown_msg = engine._get_error_response("unknown")
-    assert "confused" in unknown_msg.lower()
-
-    max_retry_msg = engine._get_error_response("max_retries")
-    assert "hard time responding" in max_retry_msg.lower()
-
-    # Unknown error type should fallback
-    fallback_msg = engine._get_error_response("nonexistent_type")
-    assert "confused" in fallback_msg.lower()
+    expected = {
+        "rate_limit": "trouble thinking",
+        "connection": "reach my thoughts",
+        "api": "not quite right",
+        "unknown": "confused",
+        "max_retries": "hard time responding",
+        # Unknown error type should fallback
+        "nonexistent_type": "confused",
+    }
+
+    for error_type, phrase in expected.items():
+        assert phrase in engine._get_error_response(error_type).lower()
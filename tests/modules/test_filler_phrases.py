@@ -2,82 +2,95 @@
 Tests for filler phrase system.
 """
 
+import os
+
 import pytest
 import numpy as np
 from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import patch
 from jf_sebastian.modules.filler_phrases import FillerPhraseManager
 
+# Decoded samples handed back by the mocked sf.read; read-only since it's shared.
+_MOCK_AUDIO = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+_MOCK_AUDIO.flags.writeable = False
 
-def test_filler_manager_initialization(tmp_path):
-    """Test FillerPhraseManager initialization."""
-    filler_dir = tmp_path / "filler_audio"
-    filler_phrases = ["Let me think...", "Hmm...", "Okay..."]
-    device_type = "teddy_ruxpin"
 
-    manager = FillerPhraseManager(filler_dir, filler_phrases, device_type)
+@pytest.fixture
+def filler_root(fs):
+    """Root for filler directories on pyfakefs's in-memory filesystem."""
+    root = Path("/fillers")
+    fs.create_dir(root)
+    return root
 
-    assert manager.filler_base_dir == filler_dir
-    assert manager.device_type == device_type
-    assert manager.filler_dir == filler_dir / device_type
-    assert manager.filler_phrases == filler_phrases
-    assert manager.filler_files == []  # No files in empty dir
 
+def _fast_touch(path):
+    """Create an empty file with a bare open/close (Path.touch also utime()s)."""
+    os.close(os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
 
-def test_filler_manager_nonexistent_directory(tmp_path, caplog):
-    """Test FillerPhraseManager with non-existent directory."""
-    import logging
 
-    nonexistent_dir = tmp_path / "does_not_exist"
-    filler_phrases = ["Test phrase"]
-    device_type = "teddy_ruxpin"
+@pytest.fixture(scope="module")
+def _shared_three_filler_manager(tmp_path_factory):
+    """Manager over filler_01..03.wav, built once and shared by the module.
 
-    with caplog.at_level(logging.WARNING):
-        manager = FillerPhraseManager(nonexistent_dir, filler_phrases, device_type)
+    Module-scoped fixtures can't use pyfakefs's per-test ``fs``, so this one
+    lives on real disk; the manager only lists the directory at construction.
+    """
+    filler_base_dir = tmp_path_factory.mktemp("filler_audio")
+    filler_dir = filler_base_dir / "teddy_ruxpin"
+    filler_dir.mkdir()
+    # Created out of order so the sorted-listing test means something
+    for name in ("filler_03.wav", "filler_01.wav", "filler_02.wav"):
+        _fast_touch(filler_dir / name)
+    return FillerPhraseManager(filler_base_dir, ["Phrase 1", "Phrase 2", "Phrase 3"], "teddy_ruxpin")
 
-    # Should warn about missing device-specific directory
-    assert any("does not exist" in record.message for record in caplog.records)
-    assert any("generate_fillers.py" in record.message for record in caplog.records)
-    assert any(device_type in record.message for record in caplog.records)
 
+@pytest.fixture
+def three_filler_manager(_shared_three_filler_manager):
+    """The shared manager with its decode cache emptied, so no test sees
+    audio decoded under another test's ``sf`` mock."""
+    _shared_three_filler_manager._decoded.clear()
+    return _shared_three_filler_manager
 
-def test_filler_manager_load_files(tmp_path):
-    """Test loading filler files from device-specific directory."""
-    filler_base_dir = tmp_path / "filler_audio"
-    device_type = "teddy_ruxpin"
-    filler_dir = filler_base_dir / device_type
-    filler_dir.mkdir(parents=True)
 
-    # Create mock filler files in device-specific directory
-    (filler_dir / "filler_01.wav").touch()
-    (filler_dir / "filler_02.wav").touch()
-    (filler_dir / "filler_03.wav").touch()
+@pytest.mark.parametrize("dir_exists,files,expected_has_fillers", [
+    (False, [], False),                # No device-specific directory yet
+    (True, [], False),                 # Directory exists but is empty
+    (True, ["filler_01.wav"], True),   # One catalogued filler
+])
+def test_filler_manager_initialization(filler_root, caplog, dir_exists, files, expected_has_fillers):
+    """Test FillerPhraseManager initialization and has_fillers per directory state."""
+    import logging
 
-    filler_phrases = ["Phrase 1", "Phrase 2", "Phrase 3"]
-    manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
+    filler_base_dir = filler_root / "filler_audio"
+    filler_phrases = ["Let me think...", "Hmm...", "Okay..."]
+    device_type = "teddy_ruxpin"
+    if dir_exists:
+        (filler_base_dir / device_type).mkdir(parents=True)
+        for name in files:
+            _fast_touch(filler_base_dir / device_type / name)
 
-    # Should have loaded all filler files
-    assert len(manager.filler_files) == 3
-    assert all(f.suffix == ".wav" for f in manager.filler_files)
-    assert all("filler_" in f.name for f in manager.filler_files)
+    with caplog.at_level(logging.WARNING):
+        manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
 
+    assert manager.filler_base_dir == filler_base_dir
+    assert manager.device_type == device_type
+    assert manager.filler_dir == filler_base_dir / device_type
+    assert manager.filler_phrases == filler_phrases
+    assert [path.name for path, _ in manager.filler_entries] == files
+    assert manager.has_fillers is expected_has_fillers
 
-def test_filler_manager_has_fillers_property(tmp_path):
-    """Test has_fillers property."""
-    filler_base_dir = tmp_path / "filler_audio"
-    device_type = "teddy_ruxpin"
-    filler_phrases = ["Test"]
+    # Only a missing device-specific directory warns, naming the device and the fix
+    messages = [record.message for record in caplog.records]
+    assert any("does not exist" in msg and device_type in msg for msg in messages) is not dir_exists
+    assert any("generate_fillers.py" in msg for msg in messages) is not dir_exists
 
-    # Empty directory (no device subdirectory)
-    manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
-    assert manager.has_fillers is False
 
-    # With files in device-specific directory
-    filler_dir = filler_base_dir / device_type
-    filler_dir.mkdir(parents=True)
-    (filler_dir / "filler_01.wav").touch()
-    manager2 = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
-    assert manager2.has_fillers is True
+def test_filler_manager_load_files(three_filler_manager):
+    """Test loading filler files from device-specific directory."""
+    # Should have catalogued exactly the filler files
+    assert {path.name for path, _ in three_filler_manager.filler_entries} == {
+        "filler_01.wav", "filler_02.wav", "filler_03.wav"
+    }
 
 
 def test_filler_manager_get_random_filler_no_files(caplog):
@@ -90,26 +103,25 @@ def test_filler_manager_get_random_filler_no_files(caplog):
         result = manager.get_random_filler()
 
     assert result is None
-    assert any("No filler files available" in record.message for record in caplog.records)
+    assert any("No filler phrases available" in record.message for record in caplog.records)
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_success(mock_wavfile, tmp_path):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_success(mock_sf, filler_root):
     """Test successful random filler retrieval."""
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
     # Create mock filler file
     filler_file = filler_dir / "filler_01.wav"
-    filler_file.touch()
+    _fast_touch(filler_file)
 
     filler_phrases = ["Let me think about that..."]
 
     # Mock wav file reading
-    mock_audio = np.array([0.1, 0.2, 0.3], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
     manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
     result = manager.get_random_filler()
@@ -124,106 +136,76 @@ def test_filler_manager_get_random_filler_success(mock_wavfile, tmp_path):
     assert audio.dtype == np.float32
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_int16_conversion(mock_wavfile, tmp_path):
-    """Test int16 to float32 conversion."""
-    filler_base_dir = tmp_path / "filler_audio"
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_requests_float32(mock_sf, filler_root):
+    """Test that decoding asks soundfile for normalized float32 samples."""
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
-    (filler_dir / "filler_01.wav").touch()
+    _fast_touch(filler_dir / "filler_01.wav")
 
-    # Mock int16 audio
-    mock_audio = np.array([32767, -32768, 0], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
     manager = FillerPhraseManager(filler_base_dir, ["test"], device_type)
     result = manager.get_random_filler()
 
     assert result is not None
-    audio, _, _ = result
+    mock_sf.read.assert_called_once_with(str(filler_dir / "filler_01.wav"), dtype='float32')
 
-    # Should be normalized to float32 in range [-1, 1]
-    assert audio.dtype == np.float32
-    assert np.all(audio >= -1.0)
-    assert np.all(audio <= 1.0)
 
-    # Check specific conversions
-    assert np.isclose(audio[0], 1.0, atol=0.01)  # 32767 / 32768 ≈ 1.0
-    assert np.isclose(audio[1], -1.0, atol=0.01)  # -32768 / 32768 = -1.0
-
-
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_int32_conversion(mock_wavfile, tmp_path):
-    """Test int32 to float32 conversion."""
-    filler_base_dir = tmp_path / "filler_audio"
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_decodes_once(mock_sf, filler_root):
+    """Test that repeated picks of the same file reuse the decoded audio."""
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
-    (filler_dir / "filler_01.wav").touch()
+    _fast_touch(filler_dir / "filler_01.wav")
 
-    # Mock int32 audio
-    mock_audio = np.array([2147483647, -2147483648, 0], dtype=np.int32)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
     manager = FillerPhraseManager(filler_base_dir, ["test"], device_type)
-    result = manager.get_random_filler()
+    first = manager.get_random_filler()
+    second = manager.get_random_filler()
 
-    assert result is not None
-    audio, _, _ = result
+    assert mock_sf.read.call_count == 1
+    assert second[0] is first[0]
+    assert second[1:] == first[1:]
 
-    # Should be normalized to float32
-    assert audio.dtype == np.float32
-    assert np.all(audio >= -1.0)
-    assert np.all(audio <= 1.0)
 
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_multiple_files(mock_sf, three_filler_manager):
+    """Test that get_random_filler can return every catalogued file."""
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
+    manager = three_filler_manager
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_multiple_files(mock_wavfile, tmp_path):
-    """Test that get_random_filler can return different files."""
-    filler_base_dir = tmp_path / "filler_audio"
-    device_type = "teddy_ruxpin"
-    filler_dir = filler_base_dir / device_type
-    filler_dir.mkdir(parents=True)
-
-    # Create multiple filler files
-    (filler_dir / "filler_01.wav").touch()
-    (filler_dir / "filler_02.wav").touch()
-    (filler_dir / "filler_03.wav").touch()
-
-    filler_phrases = ["Phrase 1", "Phrase 2", "Phrase 3"]
-
-    # Mock wav file reading
-    mock_audio = np.array([0.1, 0.2], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
-
-    manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
-
-    # Call multiple times to test randomness
-    results = [manager.get_random_filler() for _ in range(10)]
+    # Pick each file exactly once instead of sampling and hoping for coverage
+    picks = iter(range(3))
+    with patch('jf_sebastian.modules.filler_phrases.random.choice',
+               side_effect=lambda entries: entries[next(picks)]):
+        results = [manager.get_random_filler() for _ in range(3)]
 
     # All should return valid results
     assert all(r is not None for r in results)
 
-    # Should return one of the phrases
-    texts = [r[2] for r in results]
-    assert all(t in filler_phrases for t in texts)
+    # Every phrase should be reachable
+    assert {r[2] for r in results} == {"Phrase 1", "Phrase 2", "Phrase 3"}
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_index_extraction(mock_wavfile, tmp_path):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_index_extraction(mock_sf, filler_root):
     """Test extraction of filler index from filename."""
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
-    (filler_dir / "filler_05.wav").touch()
+    _fast_touch(filler_dir / "filler_05.wav")
 
     filler_phrases = ["A", "B", "C", "D", "Fifth phrase"]
 
-    mock_audio = np.array([0.1], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
     manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
     result = manager.get_random_filler()
@@ -235,21 +217,20 @@ def test_filler_manager_get_random_filler_index_extraction(mock_wavfile, tmp_pat
     assert text == "Fifth phrase"
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_invalid_index(mock_wavfile, tmp_path):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_invalid_index(mock_sf, filler_root):
     """Test handling of invalid filler index."""
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
     # File index beyond phrases list
-    (filler_dir / "filler_99.wav").touch()
+    _fast_touch(filler_dir / "filler_99.wav")
 
     filler_phrases = ["Only one phrase"]
 
-    mock_audio = np.array([0.1], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
     manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
     result = manager.get_random_filler()
@@ -261,117 +242,115 @@ def test_filler_manager_get_random_filler_invalid_index(mock_wavfile, tmp_path):
     assert text == ""
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_file_read_error(mock_wavfile, tmp_path, caplog):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_file_read_error(mock_sf, filler_root, caplog):
     """Test handling of file read errors."""
     import logging
 
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
-    (filler_dir / "filler_01.wav").touch()
+    _fast_touch(filler_dir / "filler_01.wav")
 
-    # Mock wavfile.read to raise an exception
-    mock_wavfile.read.side_effect = Exception("Corrupted file")
+    # Mock sf.read to raise an exception
+    mock_sf.read.side_effect = Exception("Corrupted file")
 
     manager = FillerPhraseManager(filler_base_dir, ["test"], device_type)
 
-    with caplog.at_level(logging.ERROR):
+    with caplog.at_level(logging.WARNING):
         result = manager.get_random_filler()
 
     # Should return None on error
     assert result is None
 
-    # Should log error
-    assert any("Error loading filler file" in record.message for record in caplog.records)
+    # Should log the failure
+    assert any("Failed to load filler filler_01.wav" in record.message for record in caplog.records)
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_get_random_filler_malformed_filename(mock_wavfile, tmp_path):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_get_random_filler_malformed_filename(mock_sf, filler_root):
     """Test handling of malformed filler filename."""
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
     # Malformed filename
-    (filler_dir / "filler_bad.wav").touch()
+    _fast_touch(filler_dir / "filler_bad.wav")
 
     filler_phrases = ["test"]
 
-    mock_audio = np.array([0.1], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
-
     manager = FillerPhraseManager(filler_base_dir, filler_phrases, device_type)
-    result = manager.get_random_filler()
-
-    assert result is not None
-    _, _, text = result
 
-    # Should return empty string for malformed filename
-    assert text == ""
+    # Malformed filenames are skipped when cataloguing, never decoded
+    assert manager.has_fillers is False
+    assert manager.get_random_filler() is None
+    mock_sf.read.assert_not_called()
 
 
-def test_filler_manager_sorted_file_list(tmp_path):
+def test_filler_manager_sorted_file_list(three_filler_manager):
     """Test that filler files are loaded in sorted order."""
-    filler_base_dir = tmp_path / "filler_audio"
+    # Files were created out of order; the catalogue should be sorted
+    assert [path.name for path, _ in three_filler_manager.filler_entries] == [
+        "filler_01.wav", "filler_02.wav", "filler_03.wav"
+    ]
+
+
+def test_filler_manager_sorts_by_numeric_index(filler_root):
+    """Test that unpadded indices sort numerically, not lexicographically."""
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
-    # Create files in non-sorted order
-    (filler_dir / "filler_03.wav").touch()
-    (filler_dir / "filler_01.wav").touch()
-    (filler_dir / "filler_02.wav").touch()
+    for name in ("filler_10.wav", "filler_9.wav", "filler_2.wav"):
+        _fast_touch(filler_dir / name)
 
-    manager = FillerPhraseManager(filler_base_dir, ["A", "B", "C"], device_type)
+    manager = FillerPhraseManager(filler_base_dir, [f"P{i}" for i in range(1, 11)], device_type)
 
-    # Should be sorted
-    assert len(manager.filler_files) == 3
-    assert manager.filler_files[0].name == "filler_01.wav"
-    assert manager.filler_files[1].name == "filler_02.wav"
-    assert manager.filler_files[2].name == "filler_03.wav"
+    assert [path.name for path, _ in manager.filler_entries] == [
+        "filler_2.wav", "filler_9.wav", "filler_10.wav"
+    ]
+    assert [text for _, text in manager.filler_entries] == ["P2", "P9", "P10"]
 
 
-def test_filler_manager_ignores_non_filler_files(tmp_path):
+def test_filler_manager_ignores_non_filler_files(filler_root):
     """Test that non-filler files are ignored."""
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
 
     # Create filler and non-filler files
-    (filler_dir / "filler_01.wav").touch()
-    (filler_dir / "other_file.wav").touch()
-    (filler_dir / "readme.txt").touch()
+    _fast_touch(filler_dir / "filler_01.wav")
+    _fast_touch(filler_dir / "other_file.wav")
+    _fast_touch(filler_dir / "readme.txt")
 
     manager = FillerPhraseManager(filler_base_dir, ["test"], device_type)
 
     # Should only load filler_*.wav files
-    assert len(manager.filler_files) == 1
-    assert manager.filler_files[0].name == "filler_01.wav"
+    assert {path.name for path, _ in manager.filler_entries} == {"filler_01.wav"}
 
 
-@patch('scipy.io.wavfile')
-def test_filler_manager_logging_on_load(mock_wavfile, tmp_path, caplog):
+@patch('jf_sebastian.modules.filler_phrases.sf')
+def test_filler_manager_logging_on_load(mock_sf, filler_root, caplog):
     """Test that loading filler produces appropriate logs."""
     import logging
 
-    filler_base_dir = tmp_path / "filler_audio"
+    filler_base_dir = filler_root / "filler_audio"
     device_type = "teddy_ruxpin"
     filler_dir = filler_base_dir / device_type
     filler_dir.mkdir(parents=True)
-    (filler_dir / "filler_01.wav").touch()
+    _fast_touch(filler_dir / "filler_01.wav")
 
-    mock_audio = np.array([0.1], dtype=np.int16)
-    mock_wavfile.read.return_value = (16000, mock_audio)
+    mock_sf.read.return_value = (_MOCK_AUDIO, 16000)
 
-    with caplog.at_level(logging.INFO):
+    with caplog.at_level(logging.DEBUG):
         manager = FillerPhraseManager(filler_base_dir, ["test"], device_type)
         result = manager.get_random_filler()
 
-    # Should log loading info with device type
+    # Should log cataloguing info with device type, then the decode
     log_messages = [record.message for record in caplog.records]
-    assert any("Loaded 1 filler phrases" in msg and device_type in msg for msg in log_messages)
-    assert any("Loaded filler: filler_01.wav" in msg for msg in log_messages)
+    assert any("Catalogued 1 filler phrases" in msg and device_type in msg for msg in log_messages)
+    assert any("Loaded filler:" in msg and "filler_01.wav" in msg for msg in log_messages)
@@ -4,7 +4,21 @@ Tests for PPM (Pulse Position Modulation) generator.
 
 import pytest
 import numpy as np
-from jf_sebastian.modules.ppm_generator import PPMGenerator
+from unittest.mock import patch
+from jf_sebastian.modules.ppm_generator import PPMGenerator, _hyphenate
+
+
+@pytest.fixture(scope="module")
+def noisy_audio():
+    """One second of deterministic 16 kHz noise, shared read-only by the module."""
+    audio = np.random.default_rng(0).standard_normal(16000, dtype=np.float32) * 0.3
+    audio.flags.writeable = False
+    return audio
+
+
+def _log_contains(caplog, text):
+    """True if any captured log message contains ``text``."""
+    return text in "\n".join(record.message for record in caplog.records)
 
 
 def test_ppm_generator_initialization():
@@ -25,11 +39,14 @@ def test_ppm_generator_custom_sample_rate():
     # Sample counts should scale with sample rate
     expected_period_samples = int(16600 / 1_000_000 * 44100)
     assert gen.period_samples == expected_period_samples
+    # Gap lookup spans min to max gap at this rate
+    assert gen._gap_samples_lut[0] == int(630 / 1_000_000 * 44100)
+    assert gen._gap_samples_lut[255] == int(1590 / 1_000_000 * 44100)
 
 
-def test_generate_ppm_signal_basic(sample_ppm_channel_values):
+def test_generate_ppm_signal_basic(sample_ppm_channel_values, ppm16k):
     """Test basic PPM signal generation."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     duration = 1.0
     signal = gen.generate_ppm_signal(duration, sample_ppm_channel_values[:60])
 
@@ -45,9 +62,9 @@ def test_generate_ppm_signal_basic(sample_ppm_channel_values):
     assert np.any(signal < -0.1)
 
 
-def test_generate_ppm_signal_zero_values():
+def test_generate_ppm_signal_zero_values(ppm16k):
     """Test PPM signal generation with all zero channel values."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     duration = 0.5
     channel_values = np.zeros((30, 8), dtype=np.uint8)
     signal = gen.generate_ppm_signal(duration, channel_values)
@@ -57,9 +74,9 @@ def test_generate_ppm_signal_zero_values():
     assert np.any(signal < 0)
 
 
-def test_generate_ppm_signal_max_values():
+def test_generate_ppm_signal_max_values(ppm16k):
     """Test PPM signal generation with maximum channel values."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     duration = 0.5
     channel_values = np.full((30, 8), 255, dtype=np.uint8)
     signal = gen.generate_ppm_signal(duration, channel_values)
@@ -70,6 +87,18 @@ def test_generate_ppm_signal_max_values():
     assert np.all(signal <= 1.0)
 
 
+
+def test_generate_ppm_signal_float_values(ppm16k):
+    """Test that float channel values produce the same signal as uint8 ones."""
+    gen = ppm16k
+    duration = 0.1
+    channel_values = np.full((6, 8), 127, dtype=np.uint8)
+
+    expected = gen.generate_ppm_signal(duration, channel_values)
+    signal = gen.generate_ppm_signal(duration, channel_values.astype(np.float64))
+
+    np.testing.assert_array_equal(signal, expected)
+
 def test_audio_to_channel_values_basic(sample_audio):
     """Test conversion of audio to PPM channel values."""
     audio, sample_rate = sample_audio
@@ -88,6 +117,9 @@ def test_audio_to_channel_values_basic(sample_audio):
     assert np.all(channel_values >= 0)
     assert np.all(channel_values <= 255)
 
+    # Each channel is a contiguous column
+    assert channel_values[:, 3].flags.c_contiguous
+
 
 def test_audio_to_channel_values_mouth_movement(sample_audio):
     """Test that mouth channels (2, 3) have movement."""
@@ -177,10 +209,10 @@ def test_audio_to_channel_values_sentiment_effect(sample_audio):
     assert np.median(eyes_neg[10:]) > np.median(eyes_pos[10:])
 
 
-def test_calculate_syllable_mouth_values_basic():
+def test_calculate_syllable_mouth_values_basic(noisy_audio, ppm16k):
     """Test syllable-based mouth value calculation."""
-    gen = PPMGenerator(sample_rate=16000)
-    audio = np.random.randn(16000).astype(np.float32) * 0.3
+    gen = ppm16k
+    audio = noisy_audio
     text = "Hello world"
 
     mouth_values = gen._calculate_syllable_mouth_values(audio, 16000, text)
@@ -194,10 +226,10 @@ def test_calculate_syllable_mouth_values_basic():
     assert len(np.unique(mouth_values)) > 1
 
 
-def test_calculate_syllable_mouth_values_empty_text():
+def test_calculate_syllable_mouth_values_empty_text(noisy_audio, ppm16k):
     """Test syllable calculation with empty text."""
-    gen = PPMGenerator(sample_rate=16000)
-    audio = np.random.randn(16000).astype(np.float32) * 0.3
+    gen = ppm16k
+    audio = noisy_audio
     text = ""
 
     mouth_values = gen._calculate_syllable_mouth_values(audio, 16000, text)
@@ -206,9 +238,9 @@ def test_calculate_syllable_mouth_values_empty_text():
     assert len(mouth_values) > 0
 
 
-def test_calculate_syllable_mouth_values_multisyllable():
+def test_calculate_syllable_mouth_values_multisyllable(ppm16k):
     """Test syllable calculation with multi-syllable words."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     # Create audio with varying amplitude
     t = np.linspace(0, 2, 32000)
     audio = (np.sin(2 * np.pi * 440 * t) * 0.5).astype(np.float32)
@@ -225,9 +257,9 @@ def test_calculate_syllable_mouth_values_multisyllable():
     assert np.any(mouth_values > 0.0)
 
 
-def test_extract_syllables_from_text():
+def test_extract_syllables_from_text(ppm16k):
     """Test syllable extraction from text."""
-    gen = PPMGenerator()
+    gen = ppm16k
     words = ["hello", "world", "extraordinary"]
 
     syllables = gen._extract_syllables_from_text(words)
@@ -237,9 +269,22 @@ def test_extract_syllables_from_text():
     assert all(isinstance(s, str) for s in syllables)
 
 
-def test_ppm_signal_timing_accuracy():
+def test_extract_syllables_memoizes_words():
+    """Test that repeated words are hyphenated once and shared across generators."""
+    _hyphenate.cache_clear()
+
+    first = PPMGenerator()._extract_syllables_from_text(["hello", "hello"])
+    second = PPMGenerator()._extract_syllables_from_text(["hello"])
+
+    assert first == second * 2
+    info = _hyphenate.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_ppm_signal_timing_accuracy(ppm16k):
     """Test that PPM signal maintains correct timing."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     duration = 1.0
     num_frames = int(duration / (gen.PERIOD / 1_000_000))
     channel_values = np.zeros((num_frames, 8), dtype=np.uint8)
@@ -251,9 +296,9 @@ def test_ppm_signal_timing_accuracy():
     assert len(signal) == expected_samples
 
 
-def test_ppm_signal_pulse_characteristics():
+def test_ppm_signal_pulse_characteristics(ppm16k):
     """Test that PPM pulses have correct characteristics."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
     duration = 0.1  # Short duration for easier analysis
     num_frames = int(duration / (gen.PERIOD / 1_000_000))
     channel_values = np.zeros((num_frames, 8), dtype=np.uint8)
@@ -281,7 +326,7 @@ def test_channel_values_smoothing(sample_audio):
     lower_jaw = channel_values[:, 3]
 
     # Calculate differences between consecutive frames
-    diffs = np.abs(np.diff(lower_jaw.astype(float)))
+    diffs = np.abs(np.diff(lower_jaw.astype(np.int16)))
 
     # Most transitions should be gradual (not jumping full range)
     large_jumps = diffs > 100
@@ -289,9 +334,9 @@ def test_channel_values_smoothing(sample_audio):
     assert np.sum(large_jumps) < len(diffs) * 0.3  # Less than 30% large jumps
 
 
-def test_ppm_signal_early_termination():
+def test_ppm_signal_early_termination(ppm16k):
     """Test PPM signal generation when sample limit is reached mid-frame."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Create channel values for more frames than samples allow
     duration = 0.05  # Very short duration (50ms)
@@ -306,12 +351,12 @@ def test_ppm_signal_early_termination():
     assert np.all(signal <= 1.0)
 
 
-def test_audio_to_channel_values_early_break():
+def test_audio_to_channel_values_early_break(noisy_audio, ppm16k):
     """Test audio_to_channel_values when audio ends early."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Very short audio (100ms)
-    audio = np.random.randn(1600).astype(np.float32) * 0.3
+    audio = noisy_audio[:1600]
     text = "Test"
 
     channel_values = gen.audio_to_channel_values(audio, 16000, text)
@@ -321,11 +366,11 @@ def test_audio_to_channel_values_early_break():
     assert channel_values.dtype == np.uint8
 
 
-def test_low_mouth_activity_warning(caplog):
+def test_low_mouth_activity_warning(caplog, ppm16k):
     """Test warning when mouth barely moves."""
     import logging
 
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Use completely silent audio to ensure < 10% mouth movement
     silent_audio = np.zeros(16000, dtype=np.float32)
@@ -334,13 +379,26 @@ def test_low_mouth_activity_warning(caplog):
         channel_values = gen.audio_to_channel_values(silent_audio, 16000, "test")
 
     # Should generate warning about low mouth activity
-    assert any("Low mouth activity" in record.message for record in caplog.records)
+    assert _log_contains(caplog, "Low mouth activity")
 
 
-def test_syllable_calculation_no_syllables_detected():
-    """Test syllable calculation when no syllables are detected."""
+def test_silent_audio_skips_syllable_parsing():
+    """Test that silent audio keeps the mouth shut without parsing syllables."""
     gen = PPMGenerator(sample_rate=16000)
-    audio = np.random.randn(16000).astype(np.float32) * 0.3
+    silent_audio = np.zeros(16000, dtype=np.float32)
+
+    with patch.object(gen, '_calculate_syllable_mouth_values') as mock_syllables:
+        channel_values = gen.audio_to_channel_values(silent_audio, 16000, "hello there")
+
+    mock_syllables.assert_not_called()
+    assert np.all(channel_values[:, 2] == 0)
+    assert np.all(channel_values[:, 3] == 0)
+
+
+def test_syllable_calculation_no_syllables_detected(noisy_audio, ppm16k):
+    """Test syllable calculation when no syllables are detected."""
+    gen = ppm16k
+    audio = noisy_audio
 
     # Text with words but syllable detection might return 0
     text = "xyz"  # Made-up word that might not parse
@@ -353,12 +411,12 @@ def test_syllable_calculation_no_syllables_detected():
     assert np.all(mouth_values <= 1.0)
 
 
-def test_syllable_calculation_audio_ends_early():
+def test_syllable_calculation_audio_ends_early(noisy_audio, ppm16k):
     """Test syllable calculation when audio segment is empty."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Very short audio with many syllables
-    audio = np.random.randn(100).astype(np.float32) * 0.3
+    audio = noisy_audio[:100]
     text = "extraordinarily hippopotamus"  # Many syllables, short audio
 
     mouth_values = gen._calculate_syllable_mouth_values(audio, 16000, text)
@@ -368,12 +426,12 @@ def test_syllable_calculation_audio_ends_early():
     assert np.all(mouth_values >= 0.0)
 
 
-def test_syllable_calculation_empty_audio_segment():
+def test_syllable_calculation_empty_audio_segment(noisy_audio, ppm16k):
     """Test handling of empty syllable audio segments."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Create scenario where syllable segments might be empty
-    audio = np.random.randn(50).astype(np.float32) * 0.3
+    audio = noisy_audio[:50]
     text = "a b c d e f g h i j"  # Many short words, little audio
 
     mouth_values = gen._calculate_syllable_mouth_values(audio, 16000, text)
@@ -383,9 +441,9 @@ def test_syllable_calculation_empty_audio_segment():
     assert np.any(mouth_values == 0.0)  # Some should be zero
 
 
-def test_extract_syllables_pyphen_fallback():
+def test_extract_syllables_pyphen_fallback(ppm16k):
     """Test syllable extraction fallback when pyphen fails."""
-    gen = PPMGenerator()
+    gen = ppm16k
 
     # Use problematic words that might cause pyphen issues
     # or mock pyphen to fail
@@ -402,28 +460,27 @@ def test_extract_syllables_pyphen_fallback():
     assert len(syllables) >= len(words)
 
 
-def test_extract_syllables_with_mock_error(monkeypatch):
+def test_extract_syllables_with_mock_error(caplog, ppm16k):
     """Test syllable extraction fallback when pyphen raises exception."""
-    gen = PPMGenerator()
-
-    # Mock pyphen to raise an exception
-    def mock_pyphen_error(*args, **kwargs):
-        raise Exception("Pyphen error")
-
-    # Patch pyphen.Pyphen to raise error
-    import sys
-    if 'pyphen' in sys.modules:
-        original_pyphen = sys.modules['pyphen'].Pyphen
-        monkeypatch.setattr('pyphen.Pyphen', mock_pyphen_error)
+    import logging
+    import syllables
 
-        words = ["test", "words"]
-        syllables = gen._extract_syllables_from_text(words)
+    gen = ppm16k
+    words = ["test", "banana"]
 
-        # Should use fallback (syllables library)
-        assert len(syllables) > 0
+    # _hyphenate is memoized and the pyphen dictionary is shared, so patching
+    # pyphen.Pyphen would be a no-op once any test has hyphenated; make the
+    # memoized helper itself fail instead.
+    with patch('jf_sebastian.modules.ppm_generator._hyphenate',
+               side_effect=Exception("Pyphen error")), \
+            caplog.at_level(logging.WARNING):
+        result = gen._extract_syllables_from_text(words)
 
-        # Restore
-        monkeypatch.setattr('pyphen.Pyphen', original_pyphen)
+    # Should use fallback (syllables library): each word repeated per estimate
+    assert _log_contains(caplog, "using fallback")
+    assert result == [
+        word for word in words for _ in range(max(1, syllables.estimate(word)))
+    ]
 
 
 def test_audio_to_channel_values_long_duration():
@@ -454,10 +511,10 @@ def test_audio_to_channel_values_long_duration():
     assert channel_values.dtype == np.uint8
 
 
-def test_syllable_calculation_pyphen_returns_empty():
+def test_syllable_calculation_pyphen_returns_empty(noisy_audio):
     """Test syllable calculation when pyphen returns no syllables."""
     gen = PPMGenerator(sample_rate=16000)
-    audio = np.random.randn(16000).astype(np.float32) * 0.3
+    audio = noisy_audio
 
     # Mock _extract_syllables_from_text to return empty list
     original_extract = gen._extract_syllables_from_text
@@ -475,9 +532,9 @@ def test_syllable_calculation_pyphen_returns_empty():
     gen._extract_syllables_from_text = original_extract
 
 
-def test_syllable_calculation_very_short_audio_many_syllables():
+def test_syllable_calculation_very_short_audio_many_syllables(ppm16k):
     """Test syllable calculation with extremely short audio and many syllables."""
-    gen = PPMGenerator(sample_rate=16000)
+    gen = ppm16k
 
     # Very short audio (2 samples) with many words
     # This will cause samples_per_syllable to be very small
@@ -495,32 +552,18 @@ def test_syllable_calculation_very_short_audio_many_syllables():
     assert np.any(mouth_values == 0.0)  # Empty segments should be zero
 
 
-def test_extract_syllables_zero_estimate(monkeypatch):
+def test_extract_syllables_zero_estimate(monkeypatch, ppm16k):
     """Test syllable extraction when syllables.estimate returns 0."""
-    gen = PPMGenerator()
+    gen = ppm16k
 
     # Mock syllables.estimate to return 0
-    def mock_estimate(word):
-        return 0
-
-    # Mock pyphen to fail (force fallback)
-    def mock_pyphen_error(*args, **kwargs):
-        raise Exception("Pyphen error")
-
-    import sys
-    if 'pyphen' in sys.modules:
-        monkeypatch.setattr('pyphen.Pyphen', mock_pyphen_error)
-
-    # Patch syllables.estimate
-    import syllables
-    original_estimate = syllables.estimate
-    monkeypatch.setattr('syllables.estimate', mock_estimate)
+    monkeypatch.setattr('syllables.estimate', lambda word: 0)
 
+    # Force the fallback through the memoized helper (see the sibling test)
     words = ["xyz", "abc"]
-    syllable_list = gen._extract_syllables_from_text(words)
+    with patch('jf_sebastian.modules.ppm_generator._hyphenate',
+               side_effect=Exception("Pyphen error")):
+        syllable_list = gen._extract_syllables_from_text(words)
 
-    # Should use count = 1 fallback (line 316)
-    assert len(syllable_list) >= len(words)
-
-    # Restore
-    monkeypatch.setattr('syllables.estimate', original_estimate)
+    # Should use count = 1 fallback: each word appears exactly once
+    assert syllable_list == ["xyz", "abc"]
@@ -193,6 +193,18 @@ def test_state_machine_reset_activity_timer():
     assert sm.idle_duration < initial_idle
 
 
+def test_state_machine_time_in_state():
+    """Test time in state resets on transition but not on activity."""
+    sm = StateMachine()
+
+    time.sleep(0.1)
+    sm.reset_activity_timer()
+    assert 0.1 <= sm.time_in_state < 5.0
+
+    sm.transition_to(ConversationState.LISTENING, trigger="test")
+    assert sm.time_in_state < 0.1
+
+
 def test_state_machine_conversation_duration_tracking():
     """Test conversation duration tracking."""
     sm = StateMachine()
@@ -248,6 +260,28 @@ def test_state_machine_multiple_callbacks():
     assert execution_order == [1, 2]
 
 
+def test_state_machine_callback_registered_during_dispatch():
+    """Test that a callback registered mid-dispatch runs from the next entry on."""
+    sm = StateMachine()
+    calls = []
+
+    def late_callback():
+        calls.append("late")
+
+    def registering_callback():
+        calls.append("first")
+        sm.register_callback(ConversationState.LISTENING, late_callback)
+
+    sm.register_callback(ConversationState.LISTENING, registering_callback)
+
+    sm.transition_to(ConversationState.LISTENING)
+    assert calls == ["first"]
+
+    sm.transition_to(ConversationState.IDLE)
+    sm.transition_to(ConversationState.LISTENING)
+    assert calls == ["first", "first", "late"]
+
+
 def test_state_machine_callback_not_executed_on_invalid_transition():
     """Test callbacks not executed on invalid transition."""
     sm = StateMachine()
@@ -7,36 +7,60 @@ from pathlib import Path
 from personalities import get_personality, list_personalities
 from personalities.base import Personality
 
+_OPENAI_TTS_VOICES = frozenset({"alloy", "echo", "fable", "onyx", "nova", "shimmer"})
+_MALE_VOICES = frozenset({"echo", "onyx", "fable", "alloy"})
 
-def test_get_personality_johnny():
-    """Test loading Johnny personality."""
-    personality = get_personality("johnny")
 
-    assert isinstance(personality, Personality)
-    assert personality.name == "Johnny"
-    assert personality.tts_voice == "shimmer"   # input voice; character comes from RVC
-    assert len(personality.filler_phrases) > 0
-    assert personality.system_prompt != ""
+class _PersonalityMap(dict):
+    """Personalities keyed by name, each loaded on first access."""
 
+    def __missing__(self, key):
+        personality = self[key] = get_personality(key)
+        return personality
 
-def test_get_personality_mr_lincoln():
-    """Test loading Mr. Lincoln personality."""
-    personality = get_personality("mr_lincoln")
 
-    assert isinstance(personality, Personality)
-    assert personality.name == "Mr. Lincoln"
-    assert personality.tts_voice == "echo"
-    assert len(personality.filler_phrases) > 0
-    assert personality.system_prompt != ""
+@pytest.fixture(scope="module")
+def personalities_map():
+    """Personalities resolved at most once for the whole module.
+
+    Loading is lazy so a broken personality.yaml only errors the tests that
+    use that personality.
+    """
+    return _PersonalityMap()
+
+
+@pytest.fixture(scope="module")
+def johnny(personalities_map):
+    return personalities_map["johnny"]
+
+
+@pytest.fixture(scope="module")
+def leopold(personalities_map):
+    return personalities_map["leopold"]
+
 
+@pytest.fixture(scope="module")
+def phrase_sets(johnny, leopold):
+    """Filler phrases as sets, built once for the uniqueness/overlap tests."""
+    return {
+        "johnny": frozenset(johnny.filler_phrases),
+        "leopold": frozenset(leopold.filler_phrases),
+    }
 
-def test_get_personality_leopold():
-    """Test loading Leopold personality."""
-    personality = get_personality("leopold")
+
+@pytest.mark.parametrize("key,expected_name,expected_voice", [
+    # Johnny's input voice is shimmer; his character comes from RVC
+    pytest.param("johnny", "Johnny", "shimmer", id="johnny"),
+    pytest.param("mr_lincoln", "Mr. Lincoln", "echo", id="mr_lincoln"),
+    pytest.param("leopold", "Leopold", "onyx", id="leopold"),
+])
+def test_get_personality(key, expected_name, expected_voice):
+    """Test loading each bundled personality."""
+    personality = get_personality(key)
 
     assert isinstance(personality, Personality)
-    assert personality.name == "Leopold"
-    assert personality.tts_voice == "onyx"
+    assert personality.name == expected_name
+    assert personality.tts_voice == expected_voice
     assert len(personality.filler_phrases) > 0
     assert personality.system_prompt != ""
 
@@ -59,167 +83,111 @@ def test_get_personality_invalid():
         get_personality("invalid_personality")
 
 
-def test_johnny_personality_properties():
-    """Test Johnny personality has all required properties."""
-    johnny = get_personality("johnny")
+@pytest.mark.parametrize("key,expected_name", [
+    pytest.param("johnny", "Johnny", id="johnny"),
+    pytest.param("mr_lincoln", "Mr. Lincoln", id="mr_lincoln"),
+])
+def test_personality_properties(personalities_map, key, expected_name):
+    """Test a personality has all required properties."""
+    personality = personalities_map[key]
 
     # Check required properties
-    assert johnny.name == "Johnny"
-    assert isinstance(johnny.system_prompt, str)
-    assert len(johnny.system_prompt) > 100  # Should be substantial
-    assert isinstance(johnny.wake_word_model_paths, list)
-    assert all(isinstance(p, Path) for p in johnny.wake_word_model_paths)
-    assert isinstance(johnny.tts_voice, str)
-    assert isinstance(johnny.filler_phrases, list)
-    assert len(johnny.filler_phrases) > 0
-    assert isinstance(johnny.filler_audio_dir, Path)
-
-
-def test_mr_lincoln_personality_properties():
-    """Test Mr. Lincoln personality has all required properties."""
-    mr_lincoln = get_personality("mr_lincoln")
-
-    # Check required properties
-    assert mr_lincoln.name == "Mr. Lincoln"
-    assert isinstance(mr_lincoln.system_prompt, str)
-    assert len(mr_lincoln.system_prompt) > 100  # Should be substantial
-    assert isinstance(mr_lincoln.wake_word_model_paths, list)
-    assert all(isinstance(p, Path) for p in mr_lincoln.wake_word_model_paths)
-    assert isinstance(mr_lincoln.tts_voice, str)
-    assert isinstance(mr_lincoln.filler_phrases, list)
-    assert len(mr_lincoln.filler_phrases) > 0
-    assert isinstance(mr_lincoln.filler_audio_dir, Path)
-
-
-def test_johnny_filler_phrases_valid():
-    """Test that Johnny's filler phrases are properly formatted."""
-    johnny = get_personality("johnny")
-
-    for phrase in johnny.filler_phrases:
-        # Should be non-empty strings
-        assert isinstance(phrase, str)
-        assert len(phrase) > 0
-        assert phrase.strip() == phrase  # No leading/trailing whitespace
-
-
-def test_leopold_filler_phrases_valid():
-    """Test that Leopold's filler phrases are properly formatted."""
-    leopold = get_personality("leopold")
-
-    for phrase in leopold.filler_phrases:
-        # Should be non-empty strings
-        assert isinstance(phrase, str)
-        assert len(phrase) > 0
-        assert phrase.strip() == phrase  # No leading/trailing whitespace
+    assert personality.name == expected_name
+    assert isinstance(personality.system_prompt, str)
+    assert len(personality.system_prompt) > 100  # Should be substantial
+    assert isinstance(personality.wake_word_model_paths, list)
+    assert all(isinstance(p, Path) for p in personality.wake_word_model_paths)
+    assert isinstance(personality.tts_voice, str)
+    assert isinstance(personality.filler_phrases, list)
+    assert len(personality.filler_phrases) > 0
+    assert isinstance(personality.filler_audio_dir, Path)
 
 
-def test_johnny_system_prompt_content():
-    """Test Johnny's system prompt contains key elements."""
-    johnny = get_personality("johnny")
-    prompt = johnny.system_prompt.lower()
+@pytest.mark.parametrize("key", ["johnny", "leopold"])
+def test_filler_phrases_valid(personalities_map, key):
+    """Test that a personality's filler phrases are properly formatted."""
+    personality = personalities_map[key]
 
-    # Should reference tiki bar theme
-    assert "tiki" in prompt or "bar" in prompt
+    # Should be non-empty strings with no leading/trailing whitespace
+    malformed = [
+        phrase for phrase in personality.filler_phrases
+        if not (isinstance(phrase, str) and phrase and phrase.strip() == phrase)
+    ]
+    assert not malformed, f"Malformed {key} phrases: {malformed}"
 
 
-def test_mr_lincoln_system_prompt_content():
-    """Test Mr. Lincoln's system prompt contains key elements."""
-    mr_lincoln = get_personality("mr_lincoln")
-    prompt = mr_lincoln.system_prompt.lower()
+@pytest.mark.parametrize("key,keywords", [
+    # Johnny: tiki bar theme
+    pytest.param("johnny", ("tiki", "bar"), id="johnny"),
+    # Mr. Lincoln: Lincoln or presidential theme
+    pytest.param("mr_lincoln", ("lincoln", "president"), id="mr_lincoln"),
+])
+def test_system_prompt_content(personalities_map, key, keywords):
+    """Test a personality's system prompt contains key elements."""
+    prompt = personalities_map[key].system_prompt.lower()
 
-    # Should reference Lincoln or presidential theme
-    assert "lincoln" in prompt or "president" in prompt
+    assert any(keyword in prompt for keyword in keywords)
 
 
-def test_personality_filler_audio_dir_structure():
+def test_personality_filler_audio_dir_structure(johnny, leopold):
     """Test that filler audio directory paths are correctly structured."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Should point to personality-specific directories
-    assert "johnny" in str(johnny.filler_audio_dir).lower()
-    assert "leopold" in str(leopold.filler_audio_dir).lower()
+    assert johnny.filler_audio_dir.parts[-2:] == ("johnny", "filler_audio")
+    assert leopold.filler_audio_dir.parts[-2:] == ("leopold", "filler_audio")
 
     # Paths should be different
     assert johnny.filler_audio_dir != leopold.filler_audio_dir
 
 
-def test_personality_has_filler_phrases():
+def test_personality_has_filler_phrases(johnny, leopold):
     """Test that personalities have filler phrases defined."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Both should have filler phrases defined
     assert len(johnny.filler_phrases) > 0
     assert len(leopold.filler_phrases) > 0
 
 
-def test_personality_base_class():
+def test_personality_base_class(johnny, leopold):
     """Test that all personalities are Personality instances."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     assert isinstance(johnny, Personality)
     assert isinstance(leopold, Personality)
 
 
-def test_personality_filler_phrase_count():
+def test_personality_filler_phrase_count(johnny, leopold):
     """Test that personalities have sufficient filler phrases."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Should have at least 10 filler phrases for variety
     assert len(johnny.filler_phrases) >= 10
     assert len(leopold.filler_phrases) >= 10
 
 
-def test_personality_filler_phrases_unique():
+def test_personality_filler_phrases_unique(johnny, leopold, phrase_sets):
     """Test that filler phrases are unique (no duplicates)."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
-    johnny_set = set(johnny.filler_phrases)
-    leopold_set = set(leopold.filler_phrases)
-
     # All phrases should be unique
-    assert len(johnny_set) == len(johnny.filler_phrases)
-    assert len(leopold_set) == len(leopold.filler_phrases)
+    assert len(phrase_sets["johnny"]) == len(johnny.filler_phrases)
+    assert len(phrase_sets["leopold"]) == len(leopold.filler_phrases)
 
 
-def test_personality_filler_phrases_substantial():
+def test_personality_filler_phrases_substantial(johnny, leopold):
     """Test that filler phrases are substantial (not too short)."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Fillers should be at least 20 characters (substantial pauses)
-    for phrase in johnny.filler_phrases:
-        assert len(phrase) >= 20, f"Johnny phrase too short: {phrase}"
+    assert min(map(len, johnny.filler_phrases)) >= 20, \
+        f"Johnny phrases too short: {[p for p in johnny.filler_phrases if len(p) < 20]}"
+    assert min(map(len, leopold.filler_phrases)) >= 20, \
+        f"Leopold phrases too short: {[p for p in leopold.filler_phrases if len(p) < 20]}"
 
-    for phrase in leopold.filler_phrases:
-        assert len(phrase) >= 20, f"Leopold phrase too short: {phrase}"
-
-
-def test_johnny_voice_appropriate():
-    """Test Johnny uses a valid TTS input voice (his character comes from RVC)."""
-    johnny = get_personality("johnny")
-
-    # The input voice is RVC-converted, so any valid OpenAI voice is fine.
-    assert johnny.tts_voice in ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
-
-
-def test_leopold_voice_appropriate():
-    """Test Leopold uses appropriate TTS voice."""
-    leopold = get_personality("leopold")
 
+@pytest.mark.parametrize("key,allowed_voices", [
+    # Johnny's input voice is RVC-converted, so any valid OpenAI voice is fine.
+    pytest.param("johnny", _OPENAI_TTS_VOICES, id="johnny"),
     # Leopold should use a voice fitting his character
-    assert leopold.tts_voice in ["echo", "onyx", "fable", "alloy"]
+    pytest.param("leopold", _MALE_VOICES, id="leopold"),
+])
+def test_voice_appropriate(personalities_map, key, allowed_voices):
+    """Test a personality uses an appropriate TTS voice."""
+    assert personalities_map[key].tts_voice in allowed_voices
 
 
-def test_personality_wake_word_model_paths_exist():
+def test_personality_wake_word_model_paths_exist(johnny, leopold):
     """Test that wake word model paths are defined."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Should have lists of Path objects
     assert isinstance(johnny.wake_word_model_paths, list)
     assert isinstance(leopold.wake_word_model_paths, list)
@@ -227,15 +195,10 @@ def test_personality_wake_word_model_paths_exist():
     assert all(isinstance(p, Path) for p in leopold.wake_word_model_paths)
 
 
-def test_personality_wake_word_models_have_onnx_extension():
+def test_personality_wake_word_models_have_onnx_extension(johnny, leopold):
     """Test that wake word models have .onnx extension."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
-    for path in johnny.wake_word_model_paths:
-        assert path.suffix == ".onnx"
-    for path in leopold.wake_word_model_paths:
-        assert path.suffix == ".onnx"
+    assert {path.suffix for path in johnny.wake_word_model_paths} == {".onnx"}
+    assert {path.suffix for path in leopold.wake_word_model_paths} == {".onnx"}
 
 
 def test_get_personality_caching():
@@ -247,27 +210,19 @@ def test_get_personality_caching():
     assert p1 is p2
 
 
-def test_personality_system_prompts_different():
+def test_personality_system_prompts_different(johnny, leopold):
     """Test that different personalities have different system prompts."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Should have distinct personalities
     assert johnny.system_prompt != leopold.system_prompt
 
 
-def test_personality_filler_phrases_different():
+def test_personality_filler_phrases_different(johnny, phrase_sets):
     """Test that different personalities have different filler phrases."""
-    johnny = get_personality("johnny")
-    leopold = get_personality("leopold")
-
     # Should have mostly different phrases
-    johnny_set = set(johnny.filler_phrases)
-    leopold_set = set(leopold.filler_phrases)
+    overlap = phrase_sets["johnny"] & phrase_sets["leopold"]
 
     # Overlap should be minimal (less than 10%)
-    overlap = johnny_set.intersection(leopold_set)
-    assert len(overlap) < len(johnny.filler_phrases) * 0.1
+    assert len(overlap) * 10 < len(johnny.filler_phrases)
 
 
 def test_list_personalities():
@@ -279,3 +234,9 @@ def test_list_personalities():
     assert "johnny" in personalities
     assert "mr_lincoln" in personalities
     assert "leopold" in personalities
+
+
+def test_every_listed_personality_loads(personalities_map):
+    """Test that every personality returned by list_personalities loads."""
+    for key in list_personalities():
+        assert isinstance(personalities_map[key], Personality)
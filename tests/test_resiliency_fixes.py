@@ -7,16 +7,24 @@ Updated for new architecture where filler is part of sequential playback queue.
 import pytest
 import time
 import numpy as np
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import DEFAULT, Mock, MagicMock, patch
 from jf_sebastian.main import TeddyRuxpinApp
 from jf_sebastian.modules.audio_output import AudioPlayer
 
 
+@pytest.fixture(scope="module")
+def dummy_stereo_audio():
+    """Short silent stereo buffer; these tests only exercise playback plumbing."""
+    audio = np.zeros((100, 2), dtype=np.float32)
+    audio.setflags(write=False)
+    return audio
+
+
 class TestAudioPlayerFlagCleanup:
     """Test that AudioPlayer._playing flag is always cleared."""
 
     @patch('jf_sebastian.modules.audio_output.pyaudio.PyAudio')
-    def test_stream_error_clears_flag(self, mock_pyaudio):
+    def test_stream_error_clears_flag(self, mock_pyaudio, dummy_stereo_audio):
         """Test that stream error clears _playing flag."""
         mock_pa = MagicMock()
         mock_pyaudio.return_value = mock_pa
@@ -26,14 +34,13 @@ class TestAudioPlayerFlagCleanup:
         player = AudioPlayer()
         player._pyaudio = mock_pa
 
-        audio = np.random.rand(100, 2).astype(np.float32)
-        player.play_stereo(audio, 48000, blocking=True)
+        player.play_stereo(dummy_stereo_audio, 48000, blocking=True)
 
         # Flag should be cleared despite error
         assert player._playing == False
 
     @patch('jf_sebastian.modules.audio_output.pyaudio.PyAudio')
-    def test_cleanup_error_clears_flag(self, mock_pyaudio):
+    def test_cleanup_error_clears_flag(self, mock_pyaudio, dummy_stereo_audio):
         """Test that cleanup error still clears _playing flag."""
         mock_pa = MagicMock()
         mock_stream = MagicMock()
@@ -45,14 +52,13 @@ class TestAudioPlayerFlagCleanup:
         player = AudioPlayer()
         player._pyaudio = mock_pa
 
-        audio = np.random.rand(100, 2).astype(np.float32)
-        player.play_stereo(audio, 48000, blocking=True)
+        player.play_stereo(dummy_stereo_audio, 48000, blocking=True)
 
         # Nested finally guarantees flag cleared
         assert player._playing == False
 
     @patch('jf_sebastian.modules.audio_output.pyaudio.PyAudio')
-    def test_pyaudio_reinit_on_none(self, mock_pyaudio):
+    def test_pyaudio_reinit_on_none(self, mock_pyaudio, dummy_stereo_audio):
         """Test that PyAudio is re-initialized if it becomes None."""
         mock_pa = MagicMock()
         mock_pyaudio.return_value = mock_pa
@@ -62,8 +68,7 @@ class TestAudioPlayerFlagCleanup:
         player = AudioPlayer()
         player._pyaudio = None  # Simulate terminated PyAudio
 
-        audio = np.random.rand(100, 2).astype(np.float32)
-        result = player.play_stereo(audio, 48000, blocking=True)
+        result = player.play_stereo(dummy_stereo_audio, 48000, blocking=True)
 
         # Should re-initialize PyAudio and succeed
         assert result == True
@@ -78,10 +83,16 @@ class TestStateRecovery:
     @patch('jf_sebastian.main.settings')
     def test_wake_stuck_paused_recovery(self, mock_settings, mock_pers, mock_device_registry):
         """Test recovery from stuck wake detector in IDLE."""
-        mock_settings.PERSONALITY = "test"
-        mock_settings.OUTPUT_DEVICE_TYPE = "test_device"
-        mock_settings.validate.return_value = []
-        mock_settings.create_debug_dirs = Mock()
+        mock_settings.configure_mock(**{
+            "PERSONALITY": "test",
+            "OUTPUT_DEVICE_TYPE": "test_device",
+            "validate.return_value": [],
+            "create_debug_dirs": Mock(),
+            # Keep the app from starting a real Heartbeat under the cwd, or
+            # from parsing the mock personality's scheduled_events_path.
+            "HEARTBEAT_FILE": None,
+            "SCHEDULER_ENABLED": False,
+        })
 
         pers = MagicMock()
         pers.name = "Test"
@@ -95,14 +106,19 @@ class TestStateRecovery:
         mock_device.validate_settings.return_value = []
         mock_device_registry.create.return_value = mock_device
 
+        # autospec the components so constructor calls and the methods the
+        # app touches on their instances are checked against the real classes
         with patch.multiple('jf_sebastian.main',
-                          WakeWordDetector=MagicMock(),
-                          AudioRecorder=MagicMock(),
-                          SpeechToText=MagicMock(),
-                          ConversationEngine=MagicMock(),
-                          TextToSpeech=MagicMock(),
-                          AudioPlayer=MagicMock(),
-                          FillerPhraseManager=MagicMock()):
+                            autospec=True,
+                            WakeWordDetector=DEFAULT,
+                            AudioRecorder=DEFAULT,
+                            SpeechToText=DEFAULT,
+                            ConversationEngine=DEFAULT,
+                            TextToSpeech=DEFAULT,
+                            AudioPlayer=DEFAULT,
+                            FillerPhraseManager=DEFAULT) as components:
+            # Instance attributes set in __init__ are not part of the spec
+            components["FillerPhraseManager"].return_value.filler_entries = []
 
             app = TeddyRuxpinApp()
             app._wake_paused_for_playback = True  # Stuck
@@ -112,6 +128,7 @@ class TestStateRecovery:
 
             # Should recover
             assert app._wake_paused_for_playback == False
+            app.wake_word_detector.resume.assert_called_once_with()
 
 
 class TestSequentialPlayback:
@@ -142,12 +159,14 @@ class TestConversationStreamingCleanup:
         """Test that streaming exceptions clean up message state."""
         from jf_sebastian.modules.conversation import ConversationEngine
 
-        mock_settings.OPENAI_API_KEY = "test-key"
-        mock_settings.MAX_HISTORY_LENGTH = 20
-        mock_settings.GPT_MODEL = "gpt-4o-mini"
-        mock_settings.CONVERSATION_TIMEOUT = 300
-        mock_settings.MAX_TOKENS_STREAMING = 1000
-        mock_settings.MIN_CHUNK_WORDS = 10
+        mock_settings.configure_mock(
+            OPENAI_API_KEY="test-key",
+            MAX_HISTORY_LENGTH=20,
+            GPT_MODEL="gpt-4o-mini",
+            CONVERSATION_TIMEOUT=300,
+            MAX_TOKENS_STREAMING=1000,
+            MIN_CHUNK_WORDS=10,
+        )
 
         # Mock streaming response that raises
         mock_stream = MagicMock()